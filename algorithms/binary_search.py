@@ -38,3 +38,45 @@ def _binary_search_aux(l: List[T], item: T, lo: int, hi: int) -> int:
     elif l[mid] == item:
         return mid
     raise ValueError(f"Comparison operator poorly implemented {item} and {l[mid]} cannot be compared.")
+
+
+def upper_bound(l: List[T], item: T) -> int:
+    """
+    Find the index just after the last element of a sorted list that is less than or equal to item.
+    Unlike binary_search, this is well defined when the list contains duplicates.
+
+    :return: The number of elements in l which are less than or equal to item.
+
+    :complexity:
+    Best/Worst Case Complexity: O(log(N)), where N is the length of l.
+    """
+    lo: int = 0
+    hi: int = len(l)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if l[mid] <= item:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def lower_bound(l: List[T], item: T) -> int:
+    """
+    Find the index of the first element of a sorted list that is greater than or equal to item.
+    This is where binary_search would return for a list without duplicates, found with a loop instead of recursion.
+
+    :return: The number of elements in l which are less than item.
+
+    :complexity:
+    Best/Worst Case Complexity: O(log(N)), where N is the length of l.
+    """
+    lo: int = 0
+    hi: int = len(l)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if l[mid] < item:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Callable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def counting_sort_pass(keys: List[int], order: List[int], exponent: int, base: int) -> List[int]:
+    """
+    Stable counting sort of the positions in order by one base-`base` digit of their keys.
+
+    Args:
+        keys (List[int]): The sort key at every position
+        order (List[int]): Positions, sorted by the lower digits
+        exponent (int): base ** (index of the digit to sort by)
+        base (int): The radix
+
+    Returns:
+        The positions in order, now also sorted by the given digit
+
+    Complexity:
+        Best/Worst Case O(N + base) where N is the length of order
+    """
+    counts: List[int] = [0] * base
+    for position in order:
+        counts[(keys[position] // exponent) % base] += 1
+
+    # Turn the counts into the first output index of each digit
+    total: int = 0
+    for digit in range(base):
+        counts[digit], total = total, total + counts[digit]
+
+    new_order: List[int] = [0] * len(order)
+    for position in order:
+        digit = (keys[position] // exponent) % base
+        new_order[counts[digit]] = position
+        counts[digit] += 1
+    return new_order
+
+
+def radix_sort(my_list: List[T], sort_key: Callable[[T], int] = lambda x: x, base: int = 256) -> List[T]:
+    """
+    Sort a list by non-negative integer keys using least significant digit radix sort.
+    The sort is stable, elements with equal keys keep their relative order.
+
+    Args:
+        my_list (List[T]): The list to sort
+        sort_key (Callable[[T], int]): Gives the non-negative integer key of an element
+        base (int): The radix used for each counting sort pass
+
+    Returns:
+        The sorted list
+
+    Raises:
+        ValueError: If a key is negative
+
+    Complexity:
+        Best/Worst Case O(D * (N + base)) where N is the length of the list
+        and D is the number of base-`base` digits of the largest key.
+        For keys bounded by a constant this is O(N).
+    """
+    keys: List[int] = [sort_key(element) for element in my_list]
+    largest: int = 0
+    for key in keys:
+        if key < 0:
+            raise ValueError(f"Radix sort needs non-negative keys, got {key}")
+        largest = max(largest, key)
+
+    order: List[int] = list(range(len(my_list)))
+    exponent: int = 1
+    while largest // exponent > 0:
+        order = counting_sort_pass(keys, order, exponent, base)
+        exponent *= base
+    return [my_list[position] for position in order]
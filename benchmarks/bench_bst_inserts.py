@@ -0,0 +1,61 @@
+"""
+Times BinarySearchTree insertions, lookups and deletions.
+
+Keys inserted in increasing order build a degenerate tree (a linked list),
+which used to hit the recursion limit after about a thousand keys. Each insert
+into that tree walks every node already there, so sequential runs are quadratic
+and use a smaller default size than the shuffled runs.
+
+Run from the repository root:
+    python -m benchmarks.bench_bst_inserts
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+from data_structures.bst import BinarySearchTree
+from random_gen import RandomGen
+
+
+def time_operations(keys: List[int]) -> tuple[float, float, float]:
+    """ Returns the seconds taken to insert, look up and delete every key. """
+    bst: BinarySearchTree = BinarySearchTree()
+
+    start = time.perf_counter()
+    for key in keys:
+        bst[key] = key
+    inserted = time.perf_counter()
+    for key in keys:
+        _ = bst[key]
+    looked_up = time.perf_counter()
+    for key in keys:
+        del bst[key]
+    deleted = time.perf_counter()
+
+    return inserted - start, looked_up - inserted, deleted - looked_up
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shuffled", type=int, nargs="+", default=[10 ** 5, 10 ** 6],
+                        help="Sizes of the runs with keys in random order")
+    parser.add_argument("--sequential", type=int, nargs="+", default=[1000, 5000, 10000],
+                        help="Sizes of the runs with keys in increasing order")
+    args = parser.parse_args()
+
+    print(f"{'order':>10} {'keys':>9} {'insert s':>9} {'lookup s':>9} {'delete s':>9}")
+    for n in args.shuffled:
+        keys: List[int] = list(range(n))
+        RandomGen.set_seed(1008)
+        RandomGen.random_shuffle(keys)
+        insert, lookup, delete = time_operations(keys)
+        print(f"{'shuffled':>10} {n:>9} {insert:>9.3f} {lookup:>9.3f} {delete:>9.3f}")
+    for n in args.sequential:
+        insert, lookup, delete = time_operations(list(range(n)))
+        print(f"{'sequential':>10} {n:>9} {insert:>9.3f} {lookup:>9.3f} {delete:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Multi-threaded stress benchmark for ConcurrentMysticalHollow.
+
+A pool of worker threads takes treasures from one shared hollow until it is
+empty. After each run the treasures handed out are checked: none may be
+handed out twice and, together with what is left, they must be exactly the
+treasures the hollow started with.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent_hollow
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from hollows import ConcurrentMysticalHollow
+from random_gen import RandomGen
+from treasure import Treasure, TreasureStore, shuffle_sample_treasures
+
+
+def make_hollow(store: TreasureStore) -> ConcurrentMysticalHollow:
+    """ Creates a hollow holding a copy of the treasures in store. """
+    hollow = ConcurrentMysticalHollow()
+    hollow.treasures = TreasureStore.from_treasures(list(store))
+    return hollow
+
+
+def worker(hollow: ConcurrentMysticalHollow, capacities: List[int]) -> List[Treasure]:
+    """ Queries the hollow once per capacity and returns what it was given. """
+    taken: List[Treasure] = []
+    for capacity in capacities:
+        treasure = hollow.get_optimal_treasure(capacity)
+        if treasure is not None:
+            taken.append(treasure)
+    return taken
+
+
+def run(store: TreasureStore, threads: int, queries_per_thread: int, max_weight: int) -> tuple[float, bool]:
+    """ Returns the time taken and whether the hollow stayed consistent. """
+    hollow = make_hollow(store)
+    # RandomGen is not thread safe, so the queries are drawn before the threads start
+    capacities: List[List[int]] = [[RandomGen.randint(1, max_weight) for _ in range(queries_per_thread)]
+                                   for _ in range(threads)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, [hollow] * threads, capacities))
+    elapsed = time.perf_counter() - start
+
+    taken = [(treasure.value, treasure.weight) for result in results for treasure in result]
+    left = [(treasure.value, treasure.weight) for treasure in hollow.get_ordered_treasures()]
+    everything = [(treasure.value, treasure.weight) for treasure in store]
+    consistent = len(set(taken)) == len(taken) and sorted(taken + left) == sorted(everything)
+    return elapsed, consistent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--treasures", type=int, default=20000, help="Treasures in the shared hollow")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    max_weight: int = 2 * args.treasures
+    RandomGen.set_seed(1008)
+    store = shuffle_sample_treasures(args.treasures, max_weight, max_weight)
+
+    print(f"{'threads':>8} {'queries':>9} {'seconds':>9} {'queries/s':>11} {'consistent':>11}")
+    for threads in args.threads:
+        # Enough queries in total to try to empty the hollow
+        queries_per_thread: int = args.treasures // threads + 1
+        elapsed, consistent = run(store, threads, queries_per_thread, max_weight)
+        total: int = threads * queries_per_thread
+        print(f"{threads:>8} {total:>9} {elapsed:>9.3f} {total / elapsed:>11.0f} {str(consistent):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares lookups in a SplayTree, a BetterBST and a plain BinarySearchTree
+when a few keys are looked up far more often than the rest.
+
+The i-th most popular key is looked up with probability proportional to
+1 / i^s (a Zipf distribution). Larger s means more skewed lookups. Which keys
+are popular is shuffled, so they are not clustered in the tree.
+
+Run from the repository root:
+    python -m benchmarks.bench_splay_zipf
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from array import array
+from typing import List
+
+from algorithms.binary_search import upper_bound
+from betterbst import BetterBST
+from data_structures.bst import BinarySearchTree
+from data_structures.splay import SplayTree
+from random_gen import RandomGen
+
+
+def zipf_lookups(keys: List[int], exponent: float, count: int) -> array:
+    """ Draws count keys, the i-th key in keys with probability proportional to 1 / i^exponent. """
+    cumulative: List[float] = []
+    total: float = 0.0
+    for rank in range(1, len(keys) + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    lookups = array('q', bytes(8 * count))
+    for i, draw in enumerate(RandomGen.random_floats(count)):
+        lookups[i] = keys[min(upper_bound(cumulative, draw * total), len(keys) - 1)]
+    return lookups
+
+
+def time_lookups(tree: BinarySearchTree, lookups: array) -> float:
+    """ Returns the seconds taken to look up every key. """
+    start = time.perf_counter()
+    for key in lookups:
+        _ = tree[key]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100000, help="Keys in each tree")
+    parser.add_argument("--lookups", type=int, default=200000, help="Lookups per measurement")
+    parser.add_argument("--exponent", type=float, nargs="+", default=[0.0, 0.8, 1.0, 1.2, 1.5],
+                        help="Zipf exponents, 0 gives uniform lookups")
+    args = parser.parse_args()
+
+    RandomGen.set_seed(1008)
+    keys: List[int] = list(range(args.keys))
+    RandomGen.random_shuffle(keys)
+
+    better_bst: BetterBST = BetterBST([(key, key) for key in range(args.keys)], presorted=True)
+    plain: BinarySearchTree = BinarySearchTree()
+    splay: SplayTree = SplayTree()
+    for key in keys:
+        plain[key] = key
+        splay[key] = key
+
+    print(f"{'exponent':>8} {'splay s':>9} {'betterbst s':>12} {'plain bst s':>12}")
+    for exponent in args.exponent:
+        # Popularity is a fresh shuffle, not the insertion order
+        popular: List[int] = keys[:]
+        RandomGen.random_shuffle(popular)
+        lookups: array = zipf_lookups(popular, exponent, args.lookups)
+        splay_time: float = time_lookups(splay, lookups)
+        better_time: float = time_lookups(better_bst, lookups)
+        plain_time: float = time_lookups(plain, lookups)
+        print(f"{exponent:>8.1f} {splay_time:>9.3f} {better_time:>12.3f} {plain_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares the rejection sampling and partial Fisher-Yates treasure generators
+as the number of treasures approaches the number of possible weights.
+
+Run from the repository root:
+    python -m benchmarks.bench_treasure_generation
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from random_gen import RandomGen
+from treasure import TreasureStore, rejection_sample_treasures, shuffle_sample_treasures
+
+
+def time_generator(generator: Callable[[int, int, int], TreasureStore], number_of_treasures: int,
+                   max_weight: int, repeats: int) -> float:
+    """ Returns the average time in milliseconds to generate one hollow's treasures. """
+    RandomGen.set_seed(1008)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        generator(number_of_treasures, max_weight, max_weight)
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-weight", type=int, nargs="+", default=[100, 1000],
+                        help="Largest weight (and value) a treasure can have")
+    parser.add_argument("--fill", type=float, nargs="+", default=[0.2, 0.5, 0.8, 0.9, 0.95],
+                        help="Number of treasures as a fraction of the largest weight")
+    parser.add_argument("--repeats", type=int, default=20, help="Hollows generated per measurement")
+    args = parser.parse_args()
+
+    print(f"{'max weight':>10} {'treasures':>10} {'rejection ms':>14} {'shuffle ms':>12} {'speedup':>8}")
+    for max_weight in args.max_weight:
+        for fill in args.fill:
+            number_of_treasures: int = max(1, int(max_weight * fill))
+            rejection: float = time_generator(rejection_sample_treasures, number_of_treasures, max_weight, args.repeats)
+            shuffle: float = time_generator(shuffle_sample_treasures, number_of_treasures, max_weight, args.repeats)
+            print(f"{max_weight:>10} {number_of_treasures:>10} {rejection:>14.3f} {shuffle:>12.3f} {rejection / shuffle:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
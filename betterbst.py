@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Tuple, TypeVar
+import copy
+from typing import Iterable, Iterator, List, Tuple, TypeVar
 
 from algorithms.mergesort import mergesort
 from data_structures.bst import BinarySearchTree
 from data_structures.linked_stack import LinkedStack
+from data_structures.node import TreeNode
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -12,7 +14,7 @@ I = TypeVar('I')
 
 
 class BetterBST(BinarySearchTree[K, I]):
-    def __init__(self, elements: List[Tuple[K, I]]) -> None:
+    def __init__(self, elements: List[Tuple[K, I]], presorted: bool = False) -> None:
         """
         Initialiser for the BetterBST class.
         We assume that the all the elements that will be inserted
@@ -26,17 +28,22 @@ class BetterBST(BinarySearchTree[K, I]):
 
         Args:
             elements(List[tuple[K, I]]): The elements to be inserted into the tree.
+            presorted(bool): True if the elements are already sorted by key, for example by a
+                linear time sort the caller could use because it knows more about the keys.
+                The sorting step is then skipped.
+
+        Raises:
+            ValueError: If a key is repeated, or presorted is True and the elements are not sorted by key.
 
         Complexity:
-            Best Case Complexity: O(n * log(n)), where n is the number of elements in the list.
-                Explanation: The method processes each element in the list to create a sorted list using merge sort by calling '__sort_elements', which has a time complexity of O(n log n). 
-                After sorting, the elements are inserted into a balanced binary search tree by calling '__build_balanced_tree', which also has a time complexity of O(n log n) for n elements. 
-                Hence, O(n * log(n) + n * log(n)) is still O(n * log(n))
+            Best Case Complexity: O(n), where n is the number of elements in the list, when presorted is True
+                and the sort is skipped. Building the tree from the sorted elements is O(n), see '__build_balanced_tree'.
             Worst Case Complexity: O(n * log(n)), where n is the number of elements in the list.
-                Explanation: The reasoning remains the same as in the best case. Sorting the elements using merge sort and building the balanced tree both have a time complexity of O(n log n).
+                Explanation: Sorting the elements with merge sort by calling '__sort_elements' is O(n log n),
+                which dominates the O(n) build.
         """
         super().__init__()
-        new_elements: List[Tuple[K, I]] = self.__sort_elements(elements)
+        new_elements: List[Tuple[K, I]] = elements if presorted else self.__sort_elements(elements)
         self.__build_balanced_tree(new_elements)
 
     def __sort_elements(self, elements: List[Tuple[K, I]]) -> List[Tuple[K, I]]:
@@ -72,28 +79,26 @@ class BetterBST(BinarySearchTree[K, I]):
         Returns:
             None
 
+        Raises:
+            ValueError: If a key is repeated or the elements are not sorted by key. The tree is not changed.
+
         Complexity:
-            (This is the actual complexity of your code, 
-            remember to define all variables used.)
-            Best Case Complexity: O(n * log(n)), where n is the number of elements in the list.
-            Worst Case Complexity: O(n * log(n)), where n is the number of elements in the list.
+            Best Case Complexity: O(n), where n is the number of elements in the list.
+            Worst Case Complexity: O(n), where n is the number of elements in the list.
 
         Justification:
-            The method uses a recursive approach to build the tree by selecting the middle element of the current list segment as the root. 
-            Although the overall operation remains linear in terms of element processing, 
-            the complexity of inserting each node into the tree contributes logarithmically to the overall time, leading to a best-case scenario of O(n log n).
-            In the worst case, each insertion operation into the balanced tree takes O(log(n)) time. 
-            As every node must be inserted into the tree, the total time complexity becomes O(n log n), 
-            as the tree may not remain perfectly balanced at all times during insertions.
-
-        Complexity requirements for full marks:
-            Best Case Complexity: O(n * log(n))
-            Worst Case Complexity: O(n * log(n))
-            where n is the number of elements in the list.
+            Each key is compared once with the one before it, to check they are strictly increasing,
+            as the nodes are not inserted through '__setitem__' which would reject a duplicate.
+            The nodes are created and linked to each other directly by '_build_tree', instead of
+            being inserted one at a time from the root, so each element costs O(1).
         """
-        self._build_tree(elements, 0, len(elements) - 1)
+        for i in range(1, len(elements)):
+            if not elements[i - 1][0] < elements[i][0]:
+                raise ValueError('Inserting duplicate or unsorted item: {0}'.format(elements[i][0]))
+        self.root = self._build_tree(elements, 0, len(elements) - 1, 1)
+        self.length = len(elements)
 
-    def _build_tree(self, elements: List[Tuple[K, I]], start: int, end: int) -> None:
+    def _build_tree(self, elements: List[Tuple[K, I]], start: int, end: int, depth: int) -> TreeNode[K, I] | None:
         """
         Auxiliary function to build a balanced binary search tree from sorted elements.
 
@@ -101,27 +106,108 @@ class BetterBST(BinarySearchTree[K, I]):
             elements (List[Tuple[K, I]]): The sorted elements used to build the balanced tree.
             start (int): The starting index of the segment to be processed.
             end (int): The ending index of the segment to be processed.
+            depth (int): The depth of the root of the subtree in the whole tree.
 
         Returns:
-            None
+            TreeNode - the root of the subtree holding the segment, None if the segment is empty.
 
         Complexity:
-            Best Case Complexity: O(n), where n is the number of elements in the list.
-            Worst Case Complexity: O(n), where n is the number of elements in the list.
+            Best Case Complexity: O(n), where n is the number of elements in the segment.
+            Worst Case Complexity: O(n), where n is the number of elements in the segment.
 
         Justification:
-            The function selects the middle element of the current segment as the root node of the subtree, ensuring that the tree remains balanced. 
-            It recursively processes the left and right segments of the array. 
-            Since each element is processed exactly once to build the tree, the overall complexity is linear, O(n). 
-
-            The recursion occurs for each element, but since we're not performing any additional logarithmic operations during each call, 
-            the time complexity remains O(n) for both the best and worst cases. 
-            Each recursive call simply focuses on a smaller segment of the list without additional overhead, leading to efficient linear processing.
+            The middle element of the segment becomes the root of the subtree, so the tree is balanced.
+            Its children are built from the left and right halves and linked to it directly,
+            then it is refreshed (bottom-up, as after an insertion) so data kept about whole subtrees is correct.
+            Each element is visited once with O(1) work, and the recursion is only O(log n) deep.
         """
         if start > end:
-            return
+            return None
         mid = (start + end) // 2
         key, item = elements[mid]
-        self[key] = item  # __setitem__ method from bst.py to insert elements
-        self._build_tree(elements, start, mid - 1)
-        self._build_tree(elements, mid + 1, end)
+        current = self.node_type(key, item, depth)
+        current.left = self._build_tree(elements, start, mid - 1, depth + 1)
+        current.right = self._build_tree(elements, mid + 1, end, depth + 1)
+        return self.refresh(current)
+
+    def update(self, sorted_pairs: List[Tuple[K, I]]) -> None:
+        """
+        Inserts a batch of key, item pairs and rebuilds the tree balanced.
+
+        Args:
+            sorted_pairs (List[Tuple[K, I]]): The pairs to insert, sorted by key.
+
+        Raises:
+            ValueError: If a key is already in the tree, repeated in the batch, or the batch is not sorted.
+                The tree is not changed.
+
+        Complexity:
+            Best Case Complexity: O(n + m), where n is the number of keys in the tree and m the number of pairs.
+            Worst Case Complexity: O(n + m), where n is the number of keys in the tree and m the number of pairs.
+                Explanation: The pairs are merged with the in-order traversal of the tree in one pass,
+                then the tree is rebuilt in linear time, instead of walking from the root for each of the m inserts.
+        """
+        elements: List[Tuple[K, I]] = merge_sorted_pairs(self.items(), sorted_pairs)
+        self.__build_balanced_tree(elements)
+
+    @staticmethod
+    def merge(a: BetterBST[K, I], b: BetterBST[K, I]) -> BetterBST[K, I]:
+        """
+        Returns a new balanced tree holding the keys of both trees. Neither tree is changed.
+        The new tree is a (shallow) copy of a, so it is the same type as a and keeps its settings.
+
+        Args:
+            a (BetterBST[K, I]): The first tree.
+            b (BetterBST[K, I]): The second tree.
+
+        Returns:
+            BetterBST[K, I] - the merged tree.
+
+        Raises:
+            ValueError: If a key is in both trees.
+
+        Complexity:
+            Best Case Complexity: O(n + m), where n and m are the number of keys in a and b.
+            Worst Case Complexity: O(n + m), where n and m are the number of keys in a and b.
+                Explanation: Both trees are traversed in order and merged in one pass, then the new tree is built in linear time.
+        """
+        merged: BetterBST[K, I] = copy.copy(a)
+        merged.__build_balanced_tree(merge_sorted_pairs(a.items(), b.items()))
+        return merged
+
+
+def merge_sorted_pairs(first: Iterable[Tuple[K, I]], second: Iterable[Tuple[K, I]]) -> List[Tuple[K, I]]:
+    """
+    Merges two sequences of key, item pairs that are sorted by key into one sorted list.
+
+    Args:
+        first (Iterable[Tuple[K, I]]): Pairs sorted by key.
+        second (Iterable[Tuple[K, I]]): Pairs sorted by key.
+
+    Returns:
+        List[Tuple[K, I]] - all the pairs, sorted by key.
+
+    Raises:
+        ValueError: If a key appears more than once, or either sequence is not sorted.
+
+    Complexity:
+        Best Case Complexity: O(n + m), where n and m are the number of pairs in first and second.
+        Worst Case Complexity: O(n + m), where n and m are the number of pairs in first and second.
+            Explanation: Each pair is compared with the head of the other sequence and the last pair taken once.
+    """
+    merged: List[Tuple[K, I]] = []
+    first_iter: Iterator[Tuple[K, I]] = iter(first)
+    second_iter: Iterator[Tuple[K, I]] = iter(second)
+    first_pair = next(first_iter, None)
+    second_pair = next(second_iter, None)
+    while first_pair is not None or second_pair is not None:
+        if second_pair is None or (first_pair is not None and first_pair[0] < second_pair[0]):
+            pair = first_pair
+            first_pair = next(first_iter, None)
+        else:
+            pair = second_pair
+            second_pair = next(second_iter, None)
+        if merged and not merged[-1][0] < pair[0]:
+            raise ValueError('Inserting duplicate or unsorted item: {0}'.format(pair[0]))
+        merged.append(pair)
+    return merged
@@ -0,0 +1,238 @@
+""" Array based Binary Search Tree.
+    Stores the tree in parallel arrays instead of linked node objects:
+    slot i holds a key, an item and the slots of its two children.
+    Slots freed by deletions are kept on a free list and reused by insertions.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from array import array
+from typing import Generic, Iterator, Tuple, TypeVar
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+NO_NODE = -1
+
+
+class ArrayBinarySearchTree(Generic[K, I]):
+    """ Binary search tree with the nodes stored in parallel arrays.
+
+        Has the same mapping interface as BinarySearchTree, but there are no
+        TreeNode objects: each entry costs a key and an item reference plus two
+        4 byte child slots. Like BinarySearchTree it does no rebalancing.
+        As there are no nodes, the tree is not iterable, use keys() or items().
+
+        Attributes:
+            * root (int): slot of the root, NO_NODE if the tree is empty
+            * length (int): number of keys in the tree
+            * slot_keys (list[K]): key of every slot, None for free slots
+            * slot_items (list[I]): item of every slot, None for free slots
+            * left (array[int]): slot of the left child of every slot, NO_NODE if none.
+              For free slots it is the next free slot instead.
+            * right (array[int]): slot of the right child of every slot, NO_NODE if none
+            * free (int): first slot of the free list, NO_NODE if no slot is free
+    """
+
+    def __init__(self) -> None:
+        """
+            Initialises an empty tree.
+            :complexity: O(1)
+        """
+        self.root: int = NO_NODE
+        self.length: int = 0
+        self.slot_keys: list[K] = []
+        self.slot_items: list[I] = []
+        self.left: array = array('i')
+        self.right: array = array('i')
+        self.free: int = NO_NODE
+
+    def __len__(self) -> int:
+        """ Returns the number of keys in the tree. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.root == NO_NODE
+
+    def capacity(self) -> int:
+        """ Returns the number of slots allocated, in use or free. """
+        return len(self.slot_keys)
+
+    def find_slot(self, key: K) -> int:
+        """
+            Returns the slot holding key, NO_NODE if it is not in the tree.
+            :complexity best: O(CompK) the key is at the root
+            :complexity worst: O(CompK * D) where D is the depth of the tree
+        """
+        keys, left, right = self.slot_keys, self.left, self.right
+        slot: int = self.root
+        while slot != NO_NODE:
+            slot_key = keys[slot]
+            if key == slot_key:
+                return slot
+            slot = left[slot] if key < slot_key else right[slot]
+        return NO_NODE
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see find_slot
+        """
+        return self.find_slot(key) != NO_NODE
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Returns the item stored with key.
+            :raises KeyError: if the key is not in the tree
+            :complexity: see find_slot
+        """
+        slot: int = self.find_slot(key)
+        if slot == NO_NODE:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.slot_items[slot]
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Inserts key with its item, in a free slot if there is one.
+            :raises ValueError: if the key is already in the tree
+            :complexity best: O(CompK) inserting at the root
+            :complexity worst: O(CompK * D) where D is the depth of the tree
+        """
+        parent: int = NO_NODE
+        went_left: bool = False
+        slot: int = self.root
+        while slot != NO_NODE:
+            if key == self.slot_keys[slot]:
+                raise ValueError('Inserting duplicate item')
+            parent = slot
+            went_left = key < self.slot_keys[slot]
+            slot = self.left[slot] if went_left else self.right[slot]
+
+        slot = self.allocate(key, item)
+        if parent == NO_NODE:
+            self.root = slot
+        elif went_left:
+            self.left[parent] = slot
+        else:
+            self.right[parent] = slot
+        self.length += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Deletes key and its item, putting the slot on the free list.
+            :raises ValueError: if the key is not in the tree
+            :complexity best: O(CompK) deleting a root with at most one child
+            :complexity worst: O(CompK * D) where D is the depth of the tree
+        """
+        parent: int = NO_NODE
+        slot: int = self.root
+        while slot != NO_NODE and key != self.slot_keys[slot]:
+            parent = slot
+            slot = self.left[slot] if key < self.slot_keys[slot] else self.right[slot]
+        if slot == NO_NODE:
+            raise ValueError('Deleting non-existent item')
+
+        if self.left[slot] != NO_NODE and self.right[slot] != NO_NODE:
+            # general case => move the successor up, then unlink the successor's slot instead
+            parent = slot
+            successor: int = self.right[slot]
+            while self.left[successor] != NO_NODE:
+                parent = successor
+                successor = self.left[successor]
+            self.slot_keys[slot] = self.slot_keys[successor]
+            self.slot_items[slot] = self.slot_items[successor]
+            slot = successor
+
+        child: int = self.left[slot] if self.left[slot] != NO_NODE else self.right[slot]
+        if parent == NO_NODE:
+            self.root = child
+        elif self.left[parent] == slot:
+            self.left[parent] = child
+        else:
+            self.right[parent] = child
+        self.release(slot)
+        self.length -= 1
+
+    def allocate(self, key: K, item: I) -> int:
+        """
+            Returns a slot holding key and item with no children, reusing a free slot if there is one.
+            :complexity: O(1) amortised
+        """
+        slot: int = self.free
+        if slot == NO_NODE:
+            self.slot_keys.append(key)
+            self.slot_items.append(item)
+            self.left.append(NO_NODE)
+            self.right.append(NO_NODE)
+            return len(self.slot_keys) - 1
+        self.free = self.left[slot]
+        self.slot_keys[slot] = key
+        self.slot_items[slot] = item
+        self.left[slot] = NO_NODE
+        self.right[slot] = NO_NODE
+        return slot
+
+    def release(self, slot: int) -> None:
+        """
+            Puts a slot on the free list, dropping its key and item.
+            :complexity: O(1)
+        """
+        self.slot_keys[slot] = None
+        self.slot_items[slot] = None
+        self.left[slot] = self.free
+        self.right[slot] = NO_NODE
+        self.free = slot
+
+    def slots(self, lo: K | None = None) -> Iterator[int]:
+        """
+            Lazily yields the slots in use with a key of at least lo (all of them if lo is None), in order of key.
+            :complexity: O(CompK * D) to find the first slot, where D is the depth of the tree,
+            then O(N) for the whole traversal, where N is the number of keys
+        """
+        stack: list[int] = []
+        slot: int = self.root
+        if lo is not None:
+            while slot != NO_NODE:
+                if self.slot_keys[slot] < lo:
+                    slot = self.right[slot]
+                else:
+                    stack.append(slot)
+                    slot = self.left[slot]
+        while True:
+            while slot != NO_NODE:
+                stack.append(slot)
+                slot = self.left[slot]
+            if not stack:
+                return
+            slot = stack.pop()
+            yield slot
+            slot = self.right[slot]
+
+    # There are no nodes to yield as BinarySearchTree.__iter__ does, iterate over keys() or items() instead.
+    # Without this, iterating would fall back to calling __getitem__ with 0, 1, 2, ...
+    __iter__ = None
+
+    def keys(self) -> Iterator[K]:
+        """
+            Lazily yields the keys in order.
+            :complexity: O(N) for the whole traversal, where N is the number of keys
+        """
+        for slot in self.slots():
+            yield self.slot_keys[slot]
+
+    def items(self, lo: K | None = None, hi: K | None = None) -> Iterator[Tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key < hi, in order of key.
+            lo or hi being None leaves that end of the range open.
+            :complexity: O(CompK * (D + k)) where D is the depth of the tree
+            and k is the number of pairs yielded
+        """
+        for slot in self.slots(lo):
+            if hi is not None and not self.slot_keys[slot] < hi:
+                return
+            yield self.slot_keys[slot], self.slot_items[slot]
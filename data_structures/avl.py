@@ -0,0 +1,159 @@
+""" AVL tree ADT.
+    A binary search tree that rebalances itself with rotations after every
+    insertion and deletion, so the heights of the two subtrees of any node
+    differ by at most one and the tree height stays O(log n).
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import copy
+from typing import Tuple, TypeVar
+
+from data_structures.bst import BinarySearchTree, BSTPostOrderIterator
+from data_structures.node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class AVLTree(BinarySearchTree[K, I]):
+    """ Self-balancing binary search tree.
+
+        Has the same mapping interface and iterators as BinarySearchTree.
+        Every node keeps the height of its subtree in `height`. Rotations move
+        whole subtrees up and down, so the `depth` set when a node was inserted
+        is not kept up to date, use `height` instead.
+
+        `is_balanced` is inherited, so it asks for every leaf to be within one
+        level of log2(n), which a valid AVL tree does not always meet. Use
+        `check_invariants` to check the AVL property itself.
+    """
+
+    def refresh(self, current: TreeNode) -> TreeNode:
+        """
+            Updates current and rotates it if one of its subtrees is two levels higher than the other.
+            Returns the root of the rebalanced subtree.
+            :complexity: O(1)
+        """
+        self.recompute(current)
+        balance: int = self.height_of(current.left) - self.height_of(current.right)
+        if balance > 1:
+            if self.height_of(current.left.left) < self.height_of(current.left.right):
+                current.left = self.rotate_left(current.left)
+            return self.rotate_right(current)
+        if balance < -1:
+            if self.height_of(current.right.right) < self.height_of(current.right.left):
+                current.right = self.rotate_right(current.right)
+            return self.rotate_left(current)
+        return current
+
+    def split(self, key: K) -> Tuple[AVLTree[K, I], AVLTree[K, I]]:
+        """
+            Splits the tree into one with the keys smaller than key and one with the rest.
+            The nodes are moved, not copied, so this tree is left empty.
+            Both trees are (shallow) copies of this one, so they keep its type and settings.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        left_root, right_root = self.split_aux(self.root, key)
+        left, right = self.detach(left_root), self.detach(right_root)
+        self.root = None
+        self.length = 0
+        return left, right
+
+    def split_aux(self, current: TreeNode | None, key: K) -> Tuple[TreeNode | None, TreeNode | None]:
+        """
+            Splits the subtree rooted at current into the keys smaller than key and the rest.
+            Going down one level and joining back is O(1 + height difference), and the differences
+            add up to the height, so the whole split is O(log(N)).
+            Returns the roots of the two subtrees.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the subtree
+        """
+        if current is None:
+            return None, None
+        left, right = current.left, current.right
+        if key <= current.key:
+            smaller, rest = self.split_aux(left, key)
+            return smaller, self.join_aux(rest, current, right)
+        smaller, rest = self.split_aux(right, key)
+        return self.join_aux(left, current, smaller), rest
+
+    @staticmethod
+    def join(left: AVLTree[K, I], right: AVLTree[K, I]) -> AVLTree[K, I]:
+        """
+            Joins two trees where every key in left is smaller than every key in right.
+            The nodes are moved, not copied, so both trees are left empty.
+            The joined tree is a (shallow) copy of left, so it keeps its type and settings.
+            :raises ValueError: if a key in left is not smaller than every key in right
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the two trees
+        """
+        if left.root is not None and right.root is not None \
+                and not left.get_maximal(left.root).key < right.get_minimal(right.root).key:
+            raise ValueError('Every key in left should be smaller than every key in right')
+
+        if right.root is None:
+            root = left.root
+        else:
+            middle = right.get_minimal(right.root)
+            del right[middle.key]
+            root = left.join_aux(left.root, middle, right.root)
+        joined = left.detach(root)
+        left.root, left.length = None, 0
+        right.root, right.length = None, 0
+        return joined
+
+    def join_aux(self, left: TreeNode | None, middle: TreeNode, right: TreeNode | None) -> TreeNode:
+        """
+            Joins the subtrees left and right with middle between them, where the keys in left are smaller
+            than middle's and the keys in right are larger. middle is linked in where the taller subtree's
+            side reaches the height of the other, then that side is refreshed back up to the root.
+            Returns the root of the joined subtree.
+            :complexity: O(1 + |height(left) - height(right)|)
+        """
+        middle = self.writable(middle)
+        left_height, right_height = self.height_of(left), self.height_of(right)
+        path: list[TreeNode] = []
+        if left_height > right_height + 1:
+            went_left = False
+            current = left
+            while self.height_of(current) > right_height + 1:
+                path.append(current)
+                current = current.right
+            middle.left, middle.right = current, right
+        elif right_height > left_height + 1:
+            went_left = True
+            current = right
+            while self.height_of(current) > left_height + 1:
+                path.append(current)
+                current = current.left
+            middle.left, middle.right = left, current
+        else:
+            went_left = False
+            middle.left, middle.right = left, right
+        return self.retrace(path, [went_left] * len(path), self.refresh(middle))
+
+    def detach(self, root: TreeNode | None) -> AVLTree[K, I]:
+        """
+            Returns a (shallow) copy of this tree holding the subtree rooted at root.
+            :complexity: O(1)
+        """
+        tree = copy.copy(self)
+        tree.root = root
+        tree.length = self.size_of(root)
+        return tree
+
+    def check_invariants(self) -> bool:
+        """
+            Debugging check that every node has the right height and size, and that
+            the heights of its subtrees differ by at most one.
+            :complexity: O(N) where N is the number of nodes in the tree
+        """
+        if self.root is None:
+            return True
+        for node in BSTPostOrderIterator(self.root):
+            left: int = self.height_of(node.left)
+            right: int = self.height_of(node.right)
+            if node.height != 1 + max(left, right) or abs(left - right) > 1 \
+                    or node.size != 1 + self.size_of(node.left) + self.size_of(node.right):
+                return False
+        return True
@@ -0,0 +1,287 @@
+""" B+ tree ADT.
+    An ordered map where every node holds up to `fanout` sorted keys in a list,
+    found with a binary search, so a lookup follows O(log_fanout(n)) references
+    instead of one per level of a binary tree. The items are all in the leaves,
+    which are linked left to right so range scans walk them in order.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic, Iterator, Tuple, TypeVar
+
+from algorithms.binary_search import lower_bound, upper_bound
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class BPlusLeaf(Generic[K, I]):
+    """ Leaf of a B+ tree: sorted keys, their items, and the next leaf in key order. """
+
+    __slots__ = ('keys', 'items', 'next')
+
+    def __init__(self, keys: list[K], items: list[I]) -> None:
+        """ Object initializer. """
+        self.keys = keys
+        self.items = items
+        self.next: BPlusLeaf[K, I] | None = None
+
+
+class BPlusInternal(Generic[K]):
+    """ Internal node of a B+ tree.
+        Has one more child than keys: the keys in children[i] are at least keys[i - 1]
+        and smaller than keys[i].
+    """
+
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys: list[K], children: list) -> None:
+        """ Object initializer. """
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree(Generic[K, I]):
+    """ B+ tree with the same mapping interface as BinarySearchTree.
+        The keys and items are kept in lists rather than nodes, so the tree is not iterable, use keys() or items().
+
+        Attributes:
+            * fanout (int): largest number of keys in a leaf and of children of an internal node
+            * min_fill (int): smallest number of keys in a leaf and of children of an
+              internal node, except for the root
+            * root (BPlusLeaf | BPlusInternal): the root, a leaf while the tree is small
+            * length (int): number of keys in the tree
+    """
+
+    MIN_FANOUT = 3
+
+    def __init__(self, fanout: int = 64) -> None:
+        """
+            Initialises an empty tree.
+            :raises ValueError: if fanout is smaller than MIN_FANOUT
+            :complexity: O(1)
+        """
+        if fanout < self.MIN_FANOUT:
+            raise ValueError('Fanout should be at least {0}'.format(self.MIN_FANOUT))
+        self.fanout: int = fanout
+        self.min_fill: int = (fanout + 1) // 2
+        self.root: BPlusLeaf[K, I] | BPlusInternal[K] = BPlusLeaf([], [])
+        self.length: int = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of keys in the tree. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.length == 0
+
+    def find_leaf(self, key: K, path: list[tuple[BPlusInternal[K], int]] | None = None) -> BPlusLeaf[K, I]:
+        """
+            Returns the leaf where key is or would be.
+            If path is given, the internal nodes passed and the child taken in each are added to it.
+            :complexity: O(CompK * log(F) * log_F(N)) where F is the fanout and N the number of keys
+        """
+        node = self.root
+        while isinstance(node, BPlusInternal):
+            index: int = upper_bound(node.keys, key)
+            if path is not None:
+                path.append((node, index))
+            node = node.children[index]
+        return node
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see find_leaf
+        """
+        leaf = self.find_leaf(key)
+        index: int = lower_bound(leaf.keys, key)
+        return index < len(leaf.keys) and leaf.keys[index] == key
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Returns the item stored with key.
+            :raises KeyError: if the key is not in the tree
+            :complexity: see find_leaf
+        """
+        leaf = self.find_leaf(key)
+        index: int = lower_bound(leaf.keys, key)
+        if index < len(leaf.keys) and leaf.keys[index] == key:
+            return leaf.items[index]
+        raise KeyError('Key not found: {0}'.format(key))
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Inserts key with its item. A node that overflows is split in two and the split
+            is passed up to its parent, growing a new root if the root splits.
+            :raises ValueError: if the key is already in the tree
+            :complexity: O(CompK * log(F) * log_F(N) + F * log_F(N)) where F is the fanout and N the number of keys,
+            the second term for shifting keys within the nodes on the path
+        """
+        path: list[tuple[BPlusInternal[K], int]] = []
+        leaf = self.find_leaf(key, path)
+        index: int = lower_bound(leaf.keys, key)
+        if index < len(leaf.keys) and leaf.keys[index] == key:
+            raise ValueError('Inserting duplicate item')
+        leaf.keys.insert(index, key)
+        leaf.items.insert(index, item)
+        self.length += 1
+        if len(leaf.keys) <= self.fanout:
+            return
+
+        # Split the leaf, the first key on the right becomes the separator
+        half: int = len(leaf.keys) // 2
+        new_node = BPlusLeaf(leaf.keys[half:], leaf.items[half:])
+        del leaf.keys[half:]
+        del leaf.items[half:]
+        new_node.next = leaf.next
+        leaf.next = new_node
+        separator: K = new_node.keys[0]
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, new_node)
+            if len(parent.children) <= self.fanout:
+                return
+            # Split the internal node, its middle key moves up instead of being copied
+            half = len(parent.children) // 2
+            separator = parent.keys[half - 1]
+            new_node = BPlusInternal(parent.keys[half:], parent.children[half:])
+            del parent.keys[half - 1:]
+            del parent.children[half:]
+
+        self.root = BPlusInternal([separator], [self.root, new_node])
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Deletes key and its item. A node left with fewer than min_fill entries borrows one
+            from a sibling, or is merged with it if the sibling has none to spare, which can
+            leave the parent short in turn. The root is dropped when it has a single child.
+            :raises ValueError: if the key is not in the tree
+            :complexity: O(CompK * log(F) * log_F(N) + F * log_F(N)) where F is the fanout and N the number of keys
+        """
+        path: list[tuple[BPlusInternal[K], int]] = []
+        leaf = self.find_leaf(key, path)
+        index: int = lower_bound(leaf.keys, key)
+        if index == len(leaf.keys) or leaf.keys[index] != key:
+            raise ValueError('Deleting non-existent item')
+        del leaf.keys[index]
+        del leaf.items[index]
+        self.length -= 1
+
+        if path and len(leaf.keys) < self.min_fill:
+            parent, index = path[-1]
+            self.__fix_leaf(parent, index)
+            while path:
+                node, _ = path.pop()
+                if not path:
+                    break
+                if len(node.children) >= self.min_fill:
+                    return
+                parent, index = path[-1]
+                self.__fix_internal(parent, index)
+
+        if isinstance(self.root, BPlusInternal) and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+
+    def __fix_leaf(self, parent: BPlusInternal[K], index: int) -> None:
+        """
+            Refills the leaf parent.children[index] from a sibling, or merges it with one.
+            :complexity: O(F) where F is the fanout
+        """
+        leaf: BPlusLeaf[K, I] = parent.children[index]
+        left: BPlusLeaf[K, I] | None = parent.children[index - 1] if index > 0 else None
+        right: BPlusLeaf[K, I] | None = parent.children[index + 1] if index + 1 < len(parent.children) else None
+        if left is not None and len(left.keys) > self.min_fill:
+            leaf.keys.insert(0, left.keys.pop())
+            leaf.items.insert(0, left.items.pop())
+            parent.keys[index - 1] = leaf.keys[0]
+        elif right is not None and len(right.keys) > self.min_fill:
+            leaf.keys.append(right.keys.pop(0))
+            leaf.items.append(right.items.pop(0))
+            parent.keys[index] = right.keys[0]
+        elif left is not None:
+            left.keys += leaf.keys
+            left.items += leaf.items
+            left.next = leaf.next
+            del parent.keys[index - 1]
+            del parent.children[index]
+        else:
+            leaf.keys += right.keys
+            leaf.items += right.items
+            leaf.next = right.next
+            del parent.keys[index]
+            del parent.children[index + 1]
+
+    def __fix_internal(self, parent: BPlusInternal[K], index: int) -> None:
+        """
+            Refills the internal node parent.children[index] from a sibling, or merges it with one.
+            Keys are rotated through the parent, as the separators of internal nodes are not in the leaves above them.
+            :complexity: O(F) where F is the fanout
+        """
+        node: BPlusInternal[K] = parent.children[index]
+        left: BPlusInternal[K] | None = parent.children[index - 1] if index > 0 else None
+        right: BPlusInternal[K] | None = parent.children[index + 1] if index + 1 < len(parent.children) else None
+        if left is not None and len(left.children) > self.min_fill:
+            node.children.insert(0, left.children.pop())
+            node.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = left.keys.pop()
+        elif right is not None and len(right.children) > self.min_fill:
+            node.children.append(right.children.pop(0))
+            node.keys.append(parent.keys[index])
+            parent.keys[index] = right.keys.pop(0)
+        elif left is not None:
+            left.keys.append(parent.keys[index - 1])
+            left.keys += node.keys
+            left.children += node.children
+            del parent.keys[index - 1]
+            del parent.children[index]
+        else:
+            node.keys.append(parent.keys[index])
+            node.keys += right.keys
+            node.children += right.children
+            del parent.keys[index]
+            del parent.children[index + 1]
+
+    # There are no nodes to yield as BinarySearchTree.__iter__ does, iterate over keys() or items() instead.
+    # Without this, iterating would fall back to calling __getitem__ with 0, 1, 2, ...
+    __iter__ = None
+
+    def keys(self) -> Iterator[K]:
+        """
+            Lazily yields the keys in order.
+            :complexity: see items
+        """
+        for key, _ in self.items():
+            yield key
+
+    def items(self, lo: K | None = None, hi: K | None = None) -> Iterator[Tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key < hi, in order of key,
+            walking along the linked leaves. lo or hi being None leaves that end of the range open.
+            :complexity: O(CompK * log(F) * log_F(N) + k) where F is the fanout,
+            N the number of keys and k the number of pairs yielded
+        """
+        if lo is None:
+            leaf = self.root
+            while isinstance(leaf, BPlusInternal):
+                leaf = leaf.children[0]
+            index: int = 0
+        else:
+            leaf = self.find_leaf(lo)
+            index = lower_bound(leaf.keys, lo)
+        while leaf is not None:
+            keys, items = leaf.keys, leaf.items
+            while index < len(keys):
+                if hi is not None and not keys[index] < hi:
+                    return
+                yield keys[index], items[index]
+                index += 1
+            leaf = leaf.next
+            index = 0
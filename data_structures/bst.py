@@ -8,11 +8,10 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-import math
 import sys
-from typing import Generic, TypeVar
+from abc import ABC, abstractmethod
+from typing import Generic, Iterator, Tuple, TypeVar
 
-from data_structures.linked_stack import LinkedStack
 from data_structures.node import TreeNode
 
 # generic types
@@ -21,51 +20,122 @@ I = TypeVar('I')
 T = TypeVar('T')
 
 
-class BSTPreOrderIterator:
-    """ Pre-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+class BSTIterator(ABC):
+    """ Base class of the stack-based BST traversals.
+
+        The stack is a list used as an array: slots are overwritten instead of
+        appended and popped, and reset reuses it for a new traversal, so nothing
+        is allocated once it has grown to the height of the tree.
+        Slots are set back to None when popped or cleared, so the stack never keeps
+        nodes alive after the traversal is done with them.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
-        self.stack.push(root)
+        self.stack: list[TreeNode[K, I]] = []
+        self.top = 0
+        self.reset(root)
+
+    @abstractmethod
+    def reset(self, root: TreeNode[K, I]) -> BSTIterator:
+        """ Restarts the iterator from root, reusing its stack. Returns itself. """
+        pass
+
+    @abstractmethod
+    def __next__(self) -> TreeNode[K, I]:
+        """ Returns the next node of the traversal. """
+        pass
+
+    def push(self, node: TreeNode[K, I]) -> None:
+        """ Pushes a node, growing the stack only when every slot is in use.
+            :complexity: O(1) amortised
+        """
 
-    def __iter__(self) -> BSTPreOrderIterator:
+        if self.top == len(self.stack):
+            self.stack.append(node)
+        else:
+            self.stack[self.top] = node
+        self.top += 1
+
+    def clear(self) -> None:
+        """ Empties the stack, clearing the slots in use but keeping them allocated.
+            :complexity: O(T) where T is the number of nodes on the stack
+        """
+
+        while self.top > 0:
+            self.top -= 1
+            self.stack[self.top] = None
+
+    def __iter__(self) -> BSTIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
 
         return self
 
+
+class BSTPreOrderIterator(BSTIterator):
+    """ Pre-order iterator for the binary search tree.
+        Performs stack-based BST traversal.
+    """
+
+    def reset(self, root: TreeNode[K, I]) -> BSTPreOrderIterator:
+        """ Restarts the iterator from root, reusing its stack. Returns itself.
+            :complexity: O(T) where T is the number of nodes the previous traversal left on the stack
+        """
+
+        self.clear()
+        if root is not None:
+            self.push(root)
+        return self
+
     def __next__(self) -> TreeNode[K, I]:
         """ The main body of the iterator.
             Returns keys of the BST one by one respecting the pre-order.
         """
 
-        if self.stack.is_empty():
+        if self.top == 0:
             raise StopIteration
-        current = self.stack.pop()
+        self.top -= 1
+        current = self.stack[self.top]
+        self.stack[self.top] = None
         if current.right:
-            self.stack.push(current.right)
+            self.push(current.right)
         if current.left:
-            self.stack.push(current.left)
+            self.push(current.left)
         return current
 
 
-class BSTInOrderIterator:
+class BSTInOrderIterator(BSTIterator):
     """ In-order iterator for the binary search tree.
         Performs stack-based BST traversal.
     """
 
-    def __init__(self, root: TreeNode[K, I]) -> None:
-        """ Iterator initialiser. """
+    def reset(self, root: TreeNode[K, I]) -> BSTInOrderIterator:
+        """ Restarts the iterator from root, reusing its stack. Returns itself.
+            :complexity: O(T) where T is the number of nodes the previous traversal left on the stack
+        """
 
-        self.stack = LinkedStack()
+        self.root = root
+        self.clear()
         self.current = root
+        return self
 
-    def __iter__(self) -> BSTInOrderIterator:
-        """ Standard __iter__() method for initialisers. Returns itself. """
+    def seek(self, key: K) -> BSTInOrderIterator:
+        """ Moves the iterator so the next node returned is the first one with a key
+            greater than or equal to key. Returns itself, so it can be used in for loops.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
 
+        self.clear()
+        self.current = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                # Everything left of node comes before it, so only node waits on the stack
+                self.push(node)
+                node = node.left
         return self
 
     def __next__(self) -> TreeNode[K, I]:
@@ -73,32 +143,38 @@ class BSTInOrderIterator:
             Returns keys of the BST one by one respecting the in-order.
         """
 
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
+        current = self.current
+        while current is not None:
+            self.push(current)
+            current = current.left
 
-        if self.stack.is_empty():
+        if self.top == 0:
+            self.current = None
             raise StopIteration
 
-        result = self.stack.pop()
+        self.top -= 1
+        result = self.stack[self.top]
+        self.stack[self.top] = None
         self.current = result.right
 
         return result
 
 
-class BSTPostOrderIterator:
+class BSTPostOrderIterator(BSTIterator):
     """ Post-order iterator for the binary search tree.
         Performs stack-based BST traversal.
+        Instead of marking stacked nodes as expanded, it remembers the last node
+        returned: a node is due once its right subtree (if any) has just been returned.
     """
 
-    def __init__(self, root: TreeNode[K, I]) -> None:
-        """ Iterator initialiser. """
-
-        self.stack = LinkedStack()
-        self.stack.push((root, False))
+    def reset(self, root: TreeNode[K, I]) -> BSTPostOrderIterator:
+        """ Restarts the iterator from root, reusing its stack. Returns itself.
+            :complexity: O(T) where T is the number of nodes the previous traversal left on the stack
+        """
 
-    def __iter__(self) -> BSTPostOrderIterator:
-        """ Standard __iter__() method for initialisers. Returns itself. """
+        self.clear()
+        self.current = root
+        self.last = None
         return self
 
     def __next__(self) -> TreeNode[K, I]:
@@ -107,21 +183,31 @@ class BSTPostOrderIterator:
         """
 
         while True:
-            if self.stack.is_empty():
+            current = self.current
+            while current is not None:
+                self.push(current)
+                current = current.left
+            self.current = None
+            if self.top == 0:
                 raise StopIteration
-            current, expanded = self.stack.pop()
-            if expanded:
-                return current
+            top = self.stack[self.top - 1]
+            if top.right and top.right is not self.last:
+                self.current = top.right
             else:
-                self.stack.push((current, True))
-                if current.right:
-                    self.stack.push((current.right, False))
-                if current.left:
-                    self.stack.push((current.left, False))
+                self.top -= 1
+                self.stack[self.top] = None
+                self.last = top
+                return top
 
 
 class BinarySearchTree(Generic[K, I]):
-    """ Basic binary search tree. """
+    """ Basic binary search tree.
+
+        New nodes are created with the class in node_type, which subclasses can set to
+        CompactTreeNode to store their nodes in __slots__.
+    """
+
+    node_type: type = TreeNode
 
     def __init__(self) -> None:
         """
@@ -173,14 +259,20 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key_aux(self.root, key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        """
+            Finds the node with the given key in the subtree rooted at current.
+            Walks down the tree in a loop, so degenerate trees do not hit the recursion limit.
+            :complexity best: O(CompK) finds the item in the root of the tree
+            :complexity worst: O(CompK * D) item is not found, where D is the depth of the tree
+        """
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def __setitem__(self, key: K, item: I) -> None:
         self.root = self.insert_aux(self.root, key, item, 1)
@@ -188,21 +280,29 @@ class BinarySearchTree(Generic[K, I]):
     def insert_aux(self, current: TreeNode, key: K, item: I, current_depth: int) -> TreeNode:
         """
             Attempts to insert an item into the tree, it uses the Key to insert it
+            Returns the new root of the subtree rooted at current.
+            The path down from current is kept in a list and retraced afterwards,
+            so degenerate trees do not hit the recursion limit.
             :complexity best: O(CompK) inserts the item at the root.
             :complexity worst: O(CompK * D) inserting at the bottom of the tree
             where D is the depth of the tree
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item, current_depth)
-            self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item, current_depth + 1)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item, current_depth + 1)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
-        return current
+        path: list[TreeNode] = []
+        went_left: list[bool] = []
+        while current is not None:
+            if key < current.key:
+                went_left.append(True)
+            elif key > current.key:
+                went_left.append(False)
+            else:  # key == current.key
+                raise ValueError('Inserting duplicate item')
+            path.append(current)
+            current = current.left if went_left[-1] else current.right
+
+        current = self.refresh(self.node_type(key, item, current_depth + len(path)))
+        self.length += 1
+        return self.retrace(path, went_left, current)
 
     def __delitem__(self, key: K) -> None:
         self.root = self.delete_aux(self.root, key)
@@ -211,33 +311,197 @@ class BinarySearchTree(Generic[K, I]):
         """
             Attempts to delete an item from the tree, it uses the Key to
             determine the node to delete.
+            Returns the new root of the subtree rooted at current.
+            The path down from current is kept in a list and retraced afterwards,
+            so degenerate trees do not hit the recursion limit.
+            :complexity best: O(CompK) deletes the root when it has at most one child
+            :complexity worst: O(CompK * D) where D is the depth of the tree
         """
+        path: list[TreeNode] = []
+        went_left: list[bool] = []
+        while current is not None and key != current.key:
+            went_left.append(key < current.key)
+            path.append(current)
+            current = current.left if went_left[-1] else current.right
 
         if current is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
+
+        if current.left is None:
+            replacement = current.right
+        elif current.right is None:
+            replacement = current.left
+        else:
+            # general case => move the successor up, then unlink it from the right subtree
+            current = self.writable(current)
+            path.append(current)
+            went_left.append(False)
+            succ = current.right
+            while succ.left is not None:
+                path.append(succ)
+                went_left.append(True)
+                succ = succ.left
             current.key = succ.key
             current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
+            replacement = succ.right
 
+        self.length -= 1
+        return self.retrace(path, went_left, replacement)
+
+    def retrace(self, path: list[TreeNode], went_left: list[bool], child: TreeNode | None) -> TreeNode | None:
+        """
+            Walks back up a path recorded on the way down, relinking each node to its
+            (possibly new) child and refreshing it.
+            went_left[i] says whether the path went to the left child of path[i].
+            Returns the new root of the subtree rooted at path[0], or child if the path is empty.
+            :complexity: O(len(path)) plus the cost of refresh on each node
+        """
+        for i in range(len(path) - 1, -1, -1):
+            parent = self.writable(path[i])
+            if went_left[i]:
+                parent.left = child
+            else:
+                parent.right = child
+            child = self.refresh(parent)
+        return child
+
+    def writable(self, current: TreeNode) -> TreeNode:
+        """
+            Returns the node to change in place of current when the tree is modified.
+            That is current itself here, persistent trees return a copy instead,
+            so earlier versions sharing current do not change.
+            :complexity: O(1)
+        """
+        return current
+
+    def refresh(self, current: TreeNode) -> TreeNode:
+        """
+            Hook called on every node whose subtree was changed by an insertion
+            or a deletion, from the bottom of the tree upwards.
+            Calls recompute on the node, subclasses that restructure the tree
+            (e.g. by rotating) do it here.
+            Returns the root of the refreshed subtree.
+            :complexity: O(1)
+        """
+        self.recompute(current)
         return current
 
+    def rotate_left(self, current: TreeNode) -> TreeNode:
+        """
+            Moves the right child of current up to take its place.
+            Returns the new root of the subtree.
+            :complexity: O(1)
+        """
+        current = self.writable(current)
+        pivot = self.writable(current.right)
+        current.right = pivot.left
+        pivot.left = current
+        self.recompute(current)
+        self.recompute(pivot)
+        return pivot
+
+    def rotate_right(self, current: TreeNode) -> TreeNode:
+        """
+            Moves the left child of current up to take its place.
+            Returns the new root of the subtree.
+            :complexity: O(1)
+        """
+        current = self.writable(current)
+        pivot = self.writable(current.left)
+        current.left = pivot.right
+        pivot.right = current
+        self.recompute(current)
+        self.recompute(pivot)
+        return pivot
+
+    def recompute(self, current: TreeNode) -> None:
+        """
+            Recomputes the data kept about the subtree rooted at current from its children.
+            Here that is the number of nodes in the subtree, its height and the height of
+            its shortest path to a leaf. Subclasses keeping more data about whole subtrees
+            on the nodes compute it here too, so it stays correct however the tree is restructured.
+            :complexity: O(1)
+        """
+        left, right = current.left, current.right
+        if left is None and right is None:
+            current.size = current.height = current.min_height = 1
+        elif left is None or right is None:
+            # A missing child is not a leaf, so only the other side counts
+            child = right if left is None else left
+            current.size = 1 + child.size
+            current.height = 1 + child.height
+            current.min_height = 1 + child.min_height
+        else:
+            current.size = 1 + left.size + right.size
+            current.height = 1 + (left.height if left.height > right.height else right.height)
+            current.min_height = 1 + (left.min_height if left.min_height < right.min_height else right.min_height)
+
+    def height_of(self, current: TreeNode | None) -> int:
+        """
+            Returns the height of the subtree rooted at current, 0 for an empty subtree.
+            :complexity: O(1)
+        """
+        return 0 if current is None else current.height
+
+    def min_height_of(self, current: TreeNode | None) -> int:
+        """
+            Returns the number of nodes on the shortest path from current down to a leaf,
+            0 for an empty subtree.
+            :complexity: O(1)
+        """
+        return 0 if current is None else current.min_height
+
+    def size_of(self, current: TreeNode | None) -> int:
+        """
+            Returns the number of nodes in the subtree rooted at current, 0 for an empty subtree.
+            :complexity: O(1)
+        """
+        return 0 if current is None else current.size
+
+    def kth(self, k: int) -> TreeNode:
+        """
+            Returns the node with the k-th smallest key, counting from 0 like a list index.
+            :raises IndexError: if k is not from 0 to len(self) - 1
+            :complexity: O(D) where D is the depth of the tree
+        """
+        if not 0 <= k < len(self):
+            raise IndexError('No key at index {0}'.format(k))
+        current = self.root
+        while True:
+            left_size: int = self.size_of(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def rank(self, key: K) -> int:
+        """
+            Returns how many keys in the tree are smaller than key.
+            The key itself does not have to be in the tree.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        smaller: int = 0
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                current = current.left
+            else:
+                smaller += self.size_of(current.left) + 1
+                current = current.right
+        return smaller
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+            Returns how many keys in the tree are in the range lo (inclusive) to hi (exclusive).
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
+
     def get_successor(self, current: TreeNode) -> TreeNode:
         """
             Get successor of the current node.
@@ -252,22 +516,75 @@ class BinarySearchTree(Generic[K, I]):
     def get_minimal(self, current: TreeNode) -> TreeNode | None:
         """
             Get a node having the smallest key in the current sub-tree.
+            :complexity: O(D) where D is the depth of the sub-tree
         """
         if current is None:
             return None
-        if current.left is None:
-            return current
-        return self.get_minimal(current.left)
+        while current.left is not None:
+            current = current.left
+        return current
 
     def get_maximal(self, current: TreeNode) -> TreeNode | None:
         """
             Get a node having the largest key in the current sub-tree.
+            :complexity: O(D) where D is the depth of the sub-tree
         """
         if current is None:
             return None
-        if current.right is None:
-            return current
-        return self.get_maximal(current.right)
+        while current.right is not None:
+            current = current.right
+        return current
+
+    def floor(self, key: K) -> TreeNode | None:
+        """
+            Get the node having the largest key less than or equal to key, None if there is none.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        found = None
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            else:
+                found = current
+                current = current.right
+        return found
+
+    def ceiling(self, key: K) -> TreeNode | None:
+        """
+            Get the node having the smallest key greater than or equal to key, None if there is none.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        found = None
+        current = self.root
+        while current is not None:
+            if current.key < key:
+                current = current.right
+            else:
+                found = current
+                current = current.left
+        return found
+
+    def lower_bound(self, key: K) -> BSTInOrderIterator:
+        """
+            Returns an in-order iterator starting at the first node with a key greater than or equal to key.
+            :complexity: O(CompK * D) to create, where D is the depth of the tree,
+            then the same as BSTInOrderIterator for each node
+        """
+        return BSTInOrderIterator(self.root).seek(key)
+
+    def items(self, lo: K | None = None, hi: K | None = None) -> Iterator[Tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key < hi, in order of key.
+            lo or hi being None leaves that end of the range open.
+            :complexity: O(CompK * (D + k)) where D is the depth of the tree
+            and k is the number of pairs yielded
+        """
+        nodes = BSTInOrderIterator(self.root) if lo is None else self.lower_bound(lo)
+        for node in nodes:
+            if hi is not None and not node.key < hi:
+                return
+            yield node.key, node.item
 
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
@@ -275,16 +592,18 @@ class BinarySearchTree(Generic[K, I]):
         return current.left is None and current.right is None
 
     def is_balanced(self) -> bool:
-        target_depth: int = math.ceil(math.log(len(self), 2))
-        return self.get_depth_aux(self.root, target_depth)
-
-    def get_depth_aux(self, current: TreeNode, target_depth: int) -> bool:
-        if current is None:
+        """
+            Checks that every leaf is within one level of depth ceil(log2(N)), where N is the
+            number of nodes. The depths of the shallowest and deepest leaves are the min_height
+            and height of the root, which are kept up to date by every insertion and deletion.
+            An empty tree is balanced.
+            :complexity: O(1)
+        """
+        if self.root is None:
             return True
-        if self.is_leaf(current):
-            cond = target_depth - 1 <= current.depth <= target_depth + 1
-            return cond
-        return self.get_depth_aux(current.left, target_depth) and self.get_depth_aux(current.right, target_depth)
+        # (n - 1).bit_length() is ceil(log2(n)), computed exactly
+        target_depth: int = (len(self) - 1).bit_length()
+        return target_depth - 1 <= self.root.min_height and self.root.height <= target_depth + 1
 
     def draw(self, to=sys.stdout):
         """ Draw the tree in the terminal. """
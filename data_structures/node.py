@@ -22,6 +22,10 @@ class TreeNode(Generic[K, I]):
             depth: the depth of the node in the tree
             The leaf of the largest subtree will have a
             depth equal to the height of the tree.
+            height: the height of the subtree rooted at the node, 1 for a leaf.
+            min_height: the number of nodes on the shortest path from the node
+            down to a leaf, 1 for a leaf.
+            size: the number of nodes in the subtree rooted at the node.
             
             :complexity: O(1)
         """
@@ -30,6 +34,9 @@ class TreeNode(Generic[K, I]):
         self.left = None
         self.right = None
         self.depth = depth
+        self.height = 1
+        self.min_height = 1
+        self.size = 1
 
     def __str__(self):
         """
@@ -44,6 +51,35 @@ class TreeNode(Generic[K, I]):
         return str(self)
 
 
+class CompactTreeNode(Generic[K, I]):
+    """ BST node with the same fields as TreeNode, stored in __slots__ instead of a __dict__.
+
+        Uses far less memory per node, but no other attributes can be added to it,
+        so it only suits trees that keep nothing beyond key, item, left, right,
+        depth, height, min_height and size on their nodes.
+        It does not inherit from TreeNode, as that would bring the __dict__ back.
+    """
+
+    __slots__ = ('key', 'item', 'left', 'right', 'depth', 'height', 'min_height', 'size')
+
+    def __init__(self, key: K, item: I = None, depth: int = 1) -> None:
+        """
+            Initialises the node in the same way as TreeNode.
+            :complexity: O(1)
+        """
+        self.key = key
+        self.item = item
+        self.left = None
+        self.right = None
+        self.depth = depth
+        self.height = 1
+        self.min_height = 1
+        self.size = 1
+
+    __str__ = TreeNode.__str__
+    __repr__ = TreeNode.__repr__
+
+
 class Node(Generic[T]):
     """ Simple linked node. It contains an item and has a reference to next node. """
 
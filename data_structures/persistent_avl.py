@@ -0,0 +1,80 @@
+""" Persistent AVL tree.
+    Every change copies the nodes on the path it touches instead of changing them,
+    so earlier versions of the tree stay intact and share every untouched subtree
+    with the newer ones.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import copy
+from typing import Tuple, TypeVar
+
+from data_structures.avl import AVLTree
+from data_structures.node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class PersistentAVLTree(AVLTree[K, I]):
+    """ AVL tree whose nodes are never changed once they are part of a version.
+
+        Has the same interface as AVLTree. `tree[key] = item` and `del tree[key]` move
+        this tree to a new version, while snapshots taken before keep seeing the old one.
+        insert and delete return the new version and leave this tree as it is.
+
+        Each change copies the O(log n) nodes it touches (the path from the root, and
+        the nodes moved by rotations), so a version costs O(log n) extra memory.
+    """
+
+    def writable(self, current: TreeNode) -> TreeNode:
+        """
+            Returns a copy of current, which can be changed without affecting other versions.
+            :complexity: O(1)
+        """
+        return copy.copy(current)
+
+    def snapshot(self) -> PersistentAVLTree[K, I]:
+        """
+            Returns the current version as a separate tree, sharing all its nodes.
+            Changes to either tree afterwards do not affect the other.
+            :complexity: O(1)
+        """
+        return copy.copy(self)
+
+    def insert(self, key: K, item: I) -> PersistentAVLTree[K, I]:
+        """
+            Returns a new version with key added, this tree is not changed.
+            :raises ValueError: if the key is already in the tree
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        version = self.snapshot()
+        version[key] = item
+        return version
+
+    def delete(self, key: K) -> PersistentAVLTree[K, I]:
+        """
+            Returns a new version with key removed, this tree is not changed.
+            :raises ValueError: if the key is not in the tree
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        version = self.snapshot()
+        del version[key]
+        return version
+
+    def split(self, key: K) -> Tuple[PersistentAVLTree[K, I], PersistentAVLTree[K, I]]:
+        """
+            Same as AVLTree.split, but this tree is not changed.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        return AVLTree.split(self.snapshot(), key)
+
+    @staticmethod
+    def join(left: PersistentAVLTree[K, I], right: PersistentAVLTree[K, I]) -> PersistentAVLTree[K, I]:
+        """
+            Same as AVLTree.join, but neither tree is changed.
+            :raises ValueError: if a key in left is not smaller than every key in right
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the two trees
+        """
+        return AVLTree.join(left.snapshot(), right.snapshot())
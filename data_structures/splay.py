@@ -0,0 +1,162 @@
+""" Splay tree ADT.
+    A binary search tree that moves every key it looks up, inserts or deletes
+    to the root with rotations. Keys used often stay near the top, so skewed
+    access patterns get cheap, and any sequence of operations costs amortised
+    O(log n) each.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import TypeVar
+
+from data_structures.bst import BinarySearchTree
+from data_structures.node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class SplayTree(BinarySearchTree[K, I]):
+    """ Self-adjusting binary search tree.
+
+        Has the same mapping interface and iterators as BinarySearchTree. Lookups change
+        the shape of the tree, but never its keys. The nodes have no parent references,
+        so the path down is recorded and the splay works back up it in a loop.
+        Rotations move whole subtrees up and down, so the `depth` set when a node was
+        inserted is not kept up to date, use `height` instead.
+    """
+
+    def descend(self, key: K) -> tuple[list[TreeNode], list[bool], TreeNode | None]:
+        """
+            Walks down from the root towards key.
+            Returns the nodes passed above the one reached, whether the path went left from each,
+            and the node holding key, or None if key is not in the tree.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        path: list[TreeNode] = []
+        went_left: list[bool] = []
+        current = self.root
+        while current is not None and key != current.key:
+            went_left.append(key < current.key)
+            path.append(current)
+            current = current.left if went_left[-1] else current.right
+        return path, went_left, current
+
+    def splay(self, path: list[TreeNode], went_left: list[bool], current: TreeNode) -> TreeNode:
+        """
+            Rotates current up to the top of the path, two levels at a time.
+            path holds the nodes above current, the first one being the root of the subtree,
+            and went_left whether current is down the left of each. Both lists are used up.
+            Returns current, now the root of the subtree.
+
+            The rotations are written out here rather than done with rotate_left and rotate_right:
+            the nodes moved down are recomputed once each, and current only once at the end,
+            as nothing reads its data while it moves up.
+            :complexity: O(len(path))
+        """
+        while path:
+            parent = path.pop()
+            parent_left: bool = went_left.pop()
+            if not path:
+                # zig: current is a child of the root
+                if parent_left:
+                    parent.left, current.right = current.right, parent
+                else:
+                    parent.right, current.left = current.left, parent
+                self.recompute(parent)
+                break
+            grandparent = path.pop()
+            grandparent_left: bool = went_left.pop()
+            if parent_left and grandparent_left:
+                # zig-zig: the parent moves up over the grandparent, then current over the parent
+                grandparent.left, parent.right = parent.right, grandparent
+                parent.left, current.right = current.right, parent
+                self.recompute(grandparent)
+                self.recompute(parent)
+            elif not parent_left and not grandparent_left:
+                grandparent.right, parent.left = parent.left, grandparent
+                parent.right, current.left = current.left, parent
+                self.recompute(grandparent)
+                self.recompute(parent)
+            else:
+                # zig-zag: current moves up over the parent, then over the grandparent
+                if parent_left:
+                    parent.left, grandparent.right = current.right, current.left
+                    current.left, current.right = grandparent, parent
+                else:
+                    parent.right, grandparent.left = current.left, current.right
+                    current.left, current.right = parent, grandparent
+                self.recompute(grandparent)
+                self.recompute(parent)
+            if path:
+                if went_left[-1]:
+                    path[-1].left = current
+                else:
+                    path[-1].right = current
+        self.recompute(current)
+        return current
+
+    def get_tree_node_by_key(self, key: K) -> TreeNode:
+        """
+            Finds the node with the given key and splays it to the root.
+            If the key is not there, the last node reached is splayed instead.
+            :raises KeyError: if the key is not in the tree
+            :complexity: O(CompK * D) where D is the depth of the tree, amortised O(CompK * log(N))
+        """
+        path, went_left, current = self.descend(key)
+        if current is None:
+            if path:
+                self.root = self.splay(path[:-1], went_left[:-1], path[-1])
+            raise KeyError('Key not found: {0}'.format(key))
+        self.root = self.splay(path, went_left, current)
+        return current
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Inserts key at the bottom of the tree, then splays it to the root.
+            :raises ValueError: if the key is already in the tree
+            :complexity: O(CompK * D) where D is the depth of the tree, amortised O(CompK * log(N))
+        """
+        path, went_left, current = self.descend(key)
+        if current is not None:
+            self.root = self.splay(path, went_left, current)
+            raise ValueError('Inserting duplicate item')
+        current = self.node_type(key, item, len(path) + 1)
+        if path:
+            if went_left[-1]:
+                path[-1].left = current
+            else:
+                path[-1].right = current
+        self.length += 1
+        self.root = self.splay(path, went_left, current)
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Splays key to the root and removes it. The largest key of the left subtree
+            is splayed to the top of that subtree, where it has no right child,
+            and the right subtree is hung there.
+            :raises ValueError: if the key is not in the tree
+            :complexity: O(CompK * D) where D is the depth of the tree, amortised O(CompK * log(N))
+        """
+        path, went_left, current = self.descend(key)
+        if current is None:
+            if path:
+                self.root = self.splay(path[:-1], went_left[:-1], path[-1])
+            raise ValueError('Deleting non-existent item')
+        self.splay(path, went_left, current)
+
+        if current.left is None:
+            self.root = current.right
+        else:
+            path, went_left = [], []
+            largest = current.left
+            while largest.right is not None:
+                path.append(largest)
+                went_left.append(False)
+                largest = largest.right
+            largest = self.splay(path, went_left, largest)
+            largest.right = current.right
+            self.recompute(largest)
+            self.root = largest
+        self.length -= 1
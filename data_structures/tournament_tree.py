@@ -0,0 +1,144 @@
+""" Tournament tree (max segment tree) over a fixed row of slots.
+
+    Each slot holds a key and an item. Every internal node remembers which slot
+    wins (has the largest key) among the live slots below it, so the best slot
+    of any prefix can be found, and a slot removed, in O(log n).
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic, List, Tuple, TypeVar
+
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class TournamentTree(Generic[K, I]):
+    """ Array based tournament tree.
+
+        Attributes:
+            * size (int): number of slots, live or removed
+            * length (int): number of live slots
+            * keys (ArrayR[K]): key of every slot
+            * items (ArrayR[I]): item of every slot
+            * winners (ArrayR[int]): winning slot of every node of the tree, -1 if none.
+              Node 1 is the root, the children of node p are 2p and 2p + 1 and
+              slot i is stored in the leaf size + i.
+    """
+
+    def __init__(self, elements: List[Tuple[K, I]]) -> None:
+        """
+            Builds the tree with one live slot per element, in the order given.
+            :complexity: O(n) where n is the number of elements
+        """
+        self.size: int = len(elements)
+        self.length: int = len(elements)
+        self.keys: ArrayR[K] = ArrayR(max(1, self.size))
+        self.items: ArrayR[I] = ArrayR(max(1, self.size))
+        self.winners: ArrayR[int] = ArrayR(max(1, 2 * self.size))
+        for i in range(self.size):
+            self.keys[i], self.items[i] = elements[i]
+            self.winners[self.size + i] = i
+        for node in range(self.size - 1, 0, -1):
+            self.winners[node] = self.__better(self.winners[2 * node], self.winners[2 * node + 1])
+
+    def __len__(self) -> int:
+        """ Returns the number of live slots. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if every slot has been removed. """
+        return self.length == 0
+
+    def __getitem__(self, index: int) -> I:
+        """
+            Returns the item of a slot.
+            :complexity: O(1)
+        """
+        return self.items[index]
+
+    def get_key(self, index: int) -> K:
+        """
+            Returns the key of a slot.
+            :complexity: O(1)
+        """
+        return self.keys[index]
+
+    def is_live(self, index: int) -> bool:
+        """
+            True if the slot has not been removed.
+            :complexity: O(1)
+        """
+        return self.winners[self.size + index] != -1
+
+    def __better(self, first: int, second: int) -> int:
+        """ Returns the winner of two slots, ties go to the earlier slot. """
+        if first == -1:
+            return second
+        if second == -1:
+            return first
+        if self.keys[second] > self.keys[first] or (self.keys[second] == self.keys[first] and second < first):
+            return second
+        return first
+
+    def prefix_max(self, end: int) -> int:
+        """
+            Finds the live slot with the largest key among slots 0 to end - 1.
+            :return: the index of that slot, or -1 if none of them is live.
+            :complexity: O(log n) where n is the number of slots
+        """
+        best = -1
+        lo = self.size
+        hi = self.size + min(end, self.size)
+        while lo < hi:
+            if lo & 1:
+                best = self.__better(best, self.winners[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = self.__better(best, self.winners[hi])
+            lo //= 2
+            hi //= 2
+        return best
+
+    def remove(self, index: int) -> None:
+        """
+            Removes a slot, it will not win any later query.
+            :pre: the slot is live
+            :raises KeyError: if the slot was already removed
+            :complexity: O(log n) where n is the number of slots
+        """
+        if not self.is_live(index):
+            raise KeyError(index)
+        self.length -= 1
+        self.__replay(index, -1)
+
+    def restore(self, index: int) -> None:
+        """
+            Makes a removed slot live again, with the key and item it had before.
+            :raises KeyError: if the slot is already live
+            :complexity: O(log n) where n is the number of slots
+        """
+        if self.is_live(index):
+            raise KeyError(index)
+        self.length += 1
+        self.__replay(index, index)
+
+    def __replay(self, index: int, leaf: int) -> None:
+        """ Sets the leaf of a slot and replays the matches on the way to the root. """
+        node = self.size + index
+        self.winners[node] = leaf
+        node //= 2
+        while node >= 1:
+            self.winners[node] = self.__better(self.winners[2 * node], self.winners[2 * node + 1])
+            node //= 2
+
+
+if __name__ == '__main__':
+    tree = TournamentTree([(3, 'a'), (9, 'b'), (4, 'c'), (7, 'd')])
+    print(tree[tree.prefix_max(4)], tree[tree.prefix_max(1)])
+    tree.remove(1)
+    print(tree[tree.prefix_max(4)], len(tree))
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from algorithms.binary_search import upper_bound
+from algorithms.mergesort import mergesort
+from algorithms.radix_sort import radix_sort
 from betterbst import BetterBST
 from data_structures.bst import BSTInOrderIterator, BinarySearchTree
 from data_structures.hash_table import LinearProbeTable
-from data_structures.heap import MaxHeap
-from data_structures.linked_queue import LinkedQueue
 from data_structures.linked_stack import LinkedStack
+from data_structures.tournament_tree import TournamentTree
+from weighted_bst import WeightedBetterBST
 """
 Ensure you have read the introduction and task 1 and understand what 
 is prohibited in this task.
@@ -15,10 +18,12 @@ And ensure your treasure data structure is not banned.
 
 """
 from abc import ABC, abstractmethod
+from array import array
+from threading import RLock
 from typing import List
 
 from config import Tiles
-from treasure import Treasure, generate_treasures
+from treasure import Treasure, TreasureStore, generate_treasure_store, generate_treasures
 
 
 class Hollow(ABC):
@@ -66,7 +71,85 @@ class Hollow(ABC):
         return len(self.treasures)
 
 
-class SpookyHollow(Hollow):
+# The generator Hollow comes with, before anything replaces it
+DEFAULT_GEN_TREASURES = Hollow.gen_treasures
+
+
+class StoredHollowMixin(ABC):
+    """
+    Shared behaviour of the hollows in this module, kept out of Hollow so its contract is unchanged.
+    Put it before Hollow in the bases, so that its __init__ is used.
+
+    The treasures are generated straight away, so the random draws happen in the same
+    order as the hollows are created, but restructuring waits until they are first needed.
+    The treasures are kept in a TreasureStore and the restructured data structure refers
+    to them by their index in it.
+    """
+
+    # The data structure restructure_hollow puts in the treasures attribute
+    structure_type: type
+
+    def __init__(self) -> None:
+        # Hollow.gen_treasures builds a Treasure per item, generate_treasure_store makes
+        # the same random draws straight into a store. Any other generator is used as it is.
+        if self.gen_treasures is DEFAULT_GEN_TREASURES:
+            self.treasures = generate_treasure_store()
+        else:
+            self.treasures = self.gen_treasures()
+
+    def ensure_restructured(self) -> None:
+        """
+        Restructures the hollow if its treasures are still the generated ones.
+        Called at the start of every method that needs the restructured treasures,
+        so hollows which are never visited are never restructured.
+
+        Complexity:
+            Best Case Complexity: O(1), the hollow has already been restructured.
+            Worst Case Complexity: O(restructure_hollow)
+        """
+        if not isinstance(self.treasures, self.structure_type):
+            self.restructure_hollow()
+
+    def take_store(self) -> TreasureStore:
+        """
+        Moves the generated treasures into the store attribute, converting a list
+        of treasures into a TreasureStore if needed. Called by restructure_hollow.
+
+        Returns:
+            TreasureStore: The store, treasures are referred to by their index in it.
+
+        Complexity:
+            Best Case Complexity: O(1), the treasures are already a TreasureStore.
+            Worst Case Complexity: O(n), where n is the number of treasures to convert.
+        """
+        if not isinstance(self.treasures, TreasureStore):
+            self.treasures = TreasureStore.from_treasures(self.treasures)
+        self.store: TreasureStore = self.treasures
+        return self.store
+
+    @abstractmethod
+    def take_optimal(self, backpack_capacity: int) -> int:
+        """
+        Removes the same treasure as get_optimal_treasure, but returns its index in the store.
+
+        Returns:
+            int - the index of the removed treasure in self.store, -1 if no treasure was viable.
+        """
+        pass
+
+    @abstractmethod
+    def put_back(self, index: int) -> None:
+        """
+        Returns a treasure removed by take_optimal (or get_optimal_treasure) to the hollow.
+
+        Args:
+            index (int): The index of the treasure in self.store.
+        """
+        pass
+
+
+class SpookyHollow(StoredHollowMixin, Hollow):
+    structure_type = WeightedBetterBST
 
     def restructure_hollow(self) -> None:
         """
@@ -82,22 +165,27 @@ class SpookyHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: O(n log n), where n is the number of treasures in the hollow
-                Explanation: The method processes each treasure in the hollow to create a list of tuples containing the negative value-to-weight ratios and corresponding treasures so that we can retrieve the maximum value-to-weight ratio first after we negate it again.
-                This operation takes O(n) time since every treasure must be iterated over. 
-                After forming this list, the elements are inserted into a BetterBST, which, on average, has a logarithmic insertion complexity for each treasure. 
-                Since there are n treasures, the overall complexity for building the BetterBST is O(n log n). Therefore, the best case complexity is O(n log n).
-            Worst Case Complexity: O(n log n), where n is the number of treasures in the hollow
+            Best Case Complexity: O(n), where n is the number of treasures in the hollow
+                Explanation: The method processes each treasure in the hollow to create a list of tuples containing the negative value-to-weight ratio keys and the index of the treasure in the TreasureStore so that we can retrieve the maximum value-to-weight ratio first after we negate it again.
+                The ratio keys are exact integers bounded by the largest value times the largest weight squared, so the treasures are ordered with a radix sort in O(n) 
+                (a constant number of counting sort passes) instead of a comparison sort, and the tree is told the elements are already sorted.
+                The WeightedBetterBST then links its nodes directly from the sorted list, taking the middle element as the root of each subtree, 
+                instead of inserting the treasures one at a time from the root, so each treasure costs O(1), including keeping the smallest treasure weight of its subtree.
+                Therefore, the best case complexity is O(n).
+            Worst Case Complexity: O(n), where n is the number of treasures in the hollow
                 Explanation: The reasoning remains the same as in the best case. Each treasure is processed exactly once to create the list, 
-                and each insertion into the BetterBST takes logarithmic time. Consequently, even in the worst-case scenario, the overall complexity does not exceed O(n log n).
+                a constant number of times by the radix sort and once by the build, whatever order the treasures were generated in.
         
         Complexity requirements for full marks:
             Best Case Complexity: O(n log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
-        elements = [(-treasure.value / treasure.weight, treasure) for treasure in self.treasures]
-        self.treasures = BetterBST(elements)
+        store = self.take_store()
+        # Sorting by increasing ratio and reversing gives increasing negated ratio keys
+        by_ratio = radix_sort(list(range(len(store))), store.ratio_keys.__getitem__)
+        elements = [(-store.ratio_keys[index], index) for index in reversed(by_ratio)]
+        self.treasures = WeightedBetterBST(elements, store.weights.__getitem__, presorted=True)
         
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -115,17 +203,21 @@ class SpookyHollow(Hollow):
             None - if all treasures are heavier than the backpack_capacity
             or the hollow is empty
 
+        The first query restructures the hollow (see ensure_restructured), the costs
+        below are for the queries after that.
+
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: O(log(n)), where n is the number of treasures in the hollow 
-                Explanation: In the best-case scenario, the optimal treasure is found quickly during the in-order traversal of the BetterBST. 
-                If the first treasure examined meets the weight requirement, it can be removed with a logarithmic time complexity operation in the binary search tree. 
-                Thus, the best-case complexity is O(log n).
-            Worst Case Complexity: O(n), where n is the number of treasures in the hollow 
-                Explanation: The worst case occurs when all treasures must be examined during the in-order traversal before the suitable treasure is found. 
-                This traversal requires visiting every node in the tree, leading to a linear complexity of O(n). Furthermore, if the optimal treasure is identified, 
-                deleting it from the tree involves a logarithmic operation, which does not change the overall linear complexity in this case.
+            Best Case Complexity: O(1)
+                Explanation: In the best-case scenario, the hollow is empty or every treasure is heavier than the backpack capacity. 
+                The smallest weight stored at the root of the WeightedBetterBST tells us this straight away, so nothing is searched or removed.
+            Worst Case Complexity: O(log(n)), where n is the number of treasures in the hollow 
+                Explanation: The tree is keyed by the negated ratio, so the optimal treasure is the first node in order that is light enough. 
+                Every node stores the smallest weight in its subtree, so at each level we know whether the answer is in the left subtree, 
+                at the node itself or in the right subtree, and only one of them is visited. 
+                The tree is built balanced and rebalanced with AVL rotations after every deletion and put_back, so its depth stays O(log(n)),
+                and this descent and the deletion that follows are both O(log(n)).
 
 
         Complexity requirements for full marks:
@@ -133,20 +225,55 @@ class SpookyHollow(Hollow):
             Worst Case Complexity: O(n)
             n is the number of treasures in the hollow 
         """
-        optimal_treasure = None
+        optimal_index = self.take_optimal(backpack_capacity)
+        return None if optimal_index == -1 else self.store[optimal_index]
 
-        # Find the first treasure that meets the weight requirement
-        for node in BSTInOrderIterator(self.treasures.root):
-            current = node.item
-            if current.weight <= backpack_capacity:
-                optimal_treasure = current
-                break
+    def take_optimal(self, backpack_capacity: int) -> int:
+        """
+        Removes the ideal treasure from the hollow and returns its index in the store, -1 if there is none.
 
-        # Remove the optimal treasure from the BetterBST
-        if optimal_treasure:
-            del self.treasures[-optimal_treasure.value / optimal_treasure.weight]
-            
-        return optimal_treasure
+        Complexity:
+            Same as get_optimal_treasure.
+        """
+        self.ensure_restructured()
+        node = self.treasures.get_first_within(backpack_capacity)
+        if node is None:
+            return -1
+
+        # Remove the optimal treasure from the tree, this also updates the stored weights
+        optimal_index = node.item
+        del self.treasures[node.key]
+        return optimal_index
+
+    def put_back(self, index: int) -> None:
+        """
+        Inserts a treasure taken from this hollow back into the tree, under its negated ratio key.
+
+        Complexity:
+            Best Case Complexity: O(log(n)), where n is the number of treasures in the hollow
+            Worst Case Complexity: O(log(n)), where n is the number of treasures in the hollow
+                Explanation: The key is inserted as a new leaf, then the tree is rebalanced with AVL rotations on the way back up,
+                so however many treasures are taken and put back, the tree stays O(log(n)) deep.
+        """
+        self.ensure_restructured()
+        self.treasures[-self.store.ratio_keys[index]] = index
+
+    def get_ordered_treasures(self) -> List[Treasure]:
+        """
+        Lists the treasures left in the hollow from the greatest to the smallest
+        value / weight ratio without removing any of them.
+
+        Returns:
+            List[Treasure] - the treasures in the order get_optimal_treasure would consider them.
+
+        Complexity:
+            Best Case Complexity: O(n), where n is the number of treasures in the hollow
+            Worst Case Complexity: O(n), where n is the number of treasures in the hollow
+                Explanation: The BetterBST is keyed by the negated ratio, so a single in-order
+                traversal visits the treasures in the required order.
+        """
+        self.ensure_restructured()
+        return [self.store[node.item] for node in BSTInOrderIterator(self.treasures.root)]
 
     def __str__(self) -> str:
         return Tiles.SPOOKY_HOLLOW.value
@@ -155,7 +282,8 @@ class SpookyHollow(Hollow):
         return str(self)
 
 
-class MysticalHollow(Hollow):
+class MysticalHollow(StoredHollowMixin, Hollow):
+    structure_type = TournamentTree
 
     def restructure_hollow(self):
         """
@@ -172,22 +300,28 @@ class MysticalHollow(Hollow):
             (This is the actual complexity of your code, 
             remember to define all variables used.)
             Best Case Complexity: O(n), where n is the number of treasures in the hollow.
-                Explanation: In the best-case scenario, if all treasures are processed in a straightforward manner, the time complexity remains linear. 
-                The method generates a list of tuples where each tuple contains the value-to-weight ratio and the corresponding treasure. 
-                The process of creating this list takes O(n) time, where n is the number of treasures. 
-                The heapification step, where the list is converted into a heap, also operates in linear time relative to the number of elements.
+                Explanation: The indices of the treasures in the TreasureStore are sorted by weight with a radix sort. 
+                Weights are bounded integers, so this is a constant number of O(n) counting sort passes. 
+                The sorted weights are copied into an int array in O(n) so that the lightest slots can be found with a binary search. 
+                The precomputed value-to-weight ratio keys of the sorted treasures are then used to build a TournamentTree of indices, 
+                where each internal node remembers the slot with the greatest ratio below it. The tree is built bottom-up in O(n).
             Worst Case Complexity: O(n), where n is the number of treasures in the hollow
-                Explanation: Similarly, the worst-case complexity is also O(n) for the same reasons. 
-                The method processes each treasure once, resulting in a linear time complexity regardless of the order of treasures or their attributes.
+                Explanation: Similarly, the worst-case complexity is also O(n) for the same reasons, 
+                neither the radix sort nor the tree construction depends on the order of the treasures.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n)
             Worst Case Complexity: O(n)
             Where n is the number of treasures in the hollow
         """
-        # Create a MaxHeap from the treasures
-        elements = [(treasure.value / treasure.weight, treasure) for treasure in self.treasures]
-        self.treasures = MaxHeap.heapify(elements)
+        # Slot i of the tournament holds the index of the i-th lightest treasure
+        store = self.take_store()
+        by_weight = radix_sort(list(range(len(store))), store.weights.__getitem__)
+        self.weights = array('i', [store.weights[index] for index in by_weight])
+        self.slots = array('i', [0] * len(store))
+        for slot, index in enumerate(by_weight):
+            self.slots[index] = slot
+        self.treasures = TournamentTree([(store.ratio_keys[index], index) for index in by_weight])
 
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -205,47 +339,208 @@ class MysticalHollow(Hollow):
             None - if all treasures are heavier than the backpack_capacity
             or the hollow is empty
 
+        The first query restructures the hollow (see ensure_restructured), the costs
+        below are for the queries after that.
+
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
             Best Case Complexity: O(log n), where n is the number of treasures in the hollow
-                Explanation: The best-case scenario occurs when the first treasure with highest value/weight ratio retrieved from the heap via get_max() meets the weight requirement. 
-                In this case, the method immediately identifies the optimal treasure, and only one heap operation (which is O(log n) complexity) is performed. 
-                The loop exits without further checks, making the best-case complexity O(log n).
+                Explanation: The slots of the TournamentTree are ordered by weight, so the treasures that fit in the backpack are exactly the slots before 
+                the upper bound of backpack_capacity in the sorted weights, found with a binary search in O(log n). 
+                The best ratio among those slots is a prefix query on the TournamentTree, which combines O(log n) stored winners.
             
-            Worst Case Complexity: O(n log n), where n is the number of treasures in the hollow
-                Explanation: The worst-case scenario arises when none of the treasures meet the weight condition until the very last treasure is checked. 
-                In this situation, the method calls get_max() for each treasure in the heap, which has a logarithmic time complexity in max heap.
-                If n treasures are checked, the complexity sums to O(n log n). 
-                Furthermore, if all treasures are heavier than the backpack capacity stored in LinkedQueue, they must be served from LinkedQueue and reinserted into the heap, which also contributes to the O(n log n) complexity.
-                If no optimal treasure is found until the last element, the loop runs n times, resulting in O(n log n) complexity.
+            Worst Case Complexity: O(log n), where n is the number of treasures in the hollow
+                Explanation: When a treasure is found, removing it only replays the matches on the path from its leaf to the root, which is O(log n). 
+                No other treasure is moved, so the cost does not depend on how many treasures are too heavy.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
+        optimal_index = self.take_optimal(backpack_capacity)
+        return None if optimal_index == -1 else self.store[optimal_index]
+
+    def take_optimal(self, backpack_capacity: int) -> int:
+        """
+        Removes the ideal treasure from the hollow and returns its index in the store, -1 if there is none.
+
+        Complexity:
+            Same as get_optimal_treasure.
+        """
+        self.ensure_restructured()
+        slot = self.treasures.prefix_max(upper_bound(self.weights, backpack_capacity))
+        if slot == -1:
+            return -1
+
+        self.treasures.remove(slot)
+        return self.treasures[slot]
+
+    def put_back(self, index: int) -> None:
+        """
+        Revives the slot of a treasure taken from this hollow.
+
+        Complexity:
+            Best Case Complexity: O(log n), where n is the number of treasures in the hollow
+            Worst Case Complexity: O(log n), where n is the number of treasures in the hollow
+                Explanation: The slot is found in O(1) and only the matches on its path to the root are replayed.
+        """
+        self.ensure_restructured()
+        self.treasures.restore(self.slots[index])
+
+    def get_optimal_treasures(self, backpack_capacities: List[int]) -> List[Treasure | None]:
+        """
+        Answers a sequence of get_optimal_treasure queries in one go.
+        The queries are applied in order, so every treasure taken by one of them
+        is no longer available to the ones after it, exactly as if get_optimal_treasure
+        had been called once per capacity.
+
+        Work is shared between the queries: the weight bound of each distinct capacity
+        is only searched for once, and once a prefix of the slots is known to hold no
+        live treasure, any later query limited to that prefix is answered without
+        touching the TournamentTree.
 
-        optimal_treasure = None
-        remaining_elements = LinkedQueue()
+        Args:
+            backpack_capacities (List[int]): The backpack capacity of each query.
 
-        # Find the optimal treasure
-        while len(self.treasures) > 0:
-            ratio, treasure = self.treasures.get_max()
-            if treasure.weight <= backpack_capacity:
-                optimal_treasure = treasure
-                break
+        Returns:
+            List[Treasure | None] - the treasure taken by each query, None where nothing fitted.
+
+        Complexity:
+            Best Case Complexity: O(q), where q is the number of queries.
+                Explanation: The hollow is empty, or every query is limited to a prefix already known to be empty.
+            Worst Case Complexity: O(q log n), where n is the number of treasures in the hollow.
+                Explanation: Each query does at most one binary search, one prefix query and one removal, each O(log n).
+        """
+        self.ensure_restructured()
+        results: List[Treasure | None] = []
+        bounds: dict[int, int] = {}
+        empty_prefix: int = 0
+        for capacity in backpack_capacities:
+            if capacity not in bounds:
+                bounds[capacity] = upper_bound(self.weights, capacity)
+            bound = bounds[capacity]
+
+            slot = -1
+            if bound > empty_prefix and not self.treasures.is_empty():
+                slot = self.treasures.prefix_max(bound)
+            if slot == -1:
+                # Removing treasures can never refill a prefix, so it stays empty for the rest of the batch
+                empty_prefix = max(empty_prefix, bound)
+                results.append(None)
             else:
-                remaining_elements.append((ratio, treasure))
+                results.append(self.store[self.treasures[slot]])
+                self.treasures.remove(slot)
+        return results
 
-        # Reinsert the remaining treasures served from LinkedQueue into the heap
-        while not remaining_elements.is_empty():
-            self.treasures.add(remaining_elements.serve())
+    def get_ordered_treasures(self) -> List[Treasure]:
+        """
+        Lists the treasures left in the hollow from the greatest to the smallest
+        value / weight ratio without removing any of them.
+
+        Returns:
+            List[Treasure] - the treasures in the order get_optimal_treasure would consider them.
 
-        return optimal_treasure
+        Complexity:
+            Best Case Complexity: O(n log n), where n is the number of treasures in the hollow
+            Worst Case Complexity: O(n log n), where n is the number of treasures in the hollow
+                Explanation: The live slots of the TournamentTree are collected in O(n)
+                and merge sorted by decreasing ratio. The hollow itself is never touched.
+        """
+        self.ensure_restructured()
+        elements = [(self.treasures.get_key(slot), self.treasures[slot])
+                    for slot in range(self.treasures.size) if self.treasures.is_live(slot)]
+        return [self.store[index] for _, index in mergesort(elements, lambda element: -element[0])]
 
     def __str__(self) -> str:
         return Tiles.MYSTICAL_HOLLOW.value
 
     def __repr__(self) -> str:
         return str(self)
+
+
+class ConcurrentMysticalHollow(MysticalHollow):
+    """
+    A MysticalHollow that can be shared by several threads, for example agents
+    exploring the same maze from a worker pool.
+
+    Every query finds and removes its treasure while holding the hollow's lock, so
+    each take is atomic: two threads can never be handed the same treasure and the
+    TournamentTree is never seen half updated. With the tournament tree a take is
+    only O(log n), so one lock per hollow keeps the critical sections short.
+    """
+
+    def __init__(self) -> None:
+        # Re-entrant, as the queries restructure the hollow while holding it
+        self.lock: RLock = RLock()
+        super().__init__()
+
+    def ensure_restructured(self) -> None:
+        """
+        Restructures the hollow at most once, even if several threads query it first at the same time.
+
+        Complexity:
+            Best Case Complexity: O(1), the hollow has already been restructured.
+            Worst Case Complexity: O(restructure_hollow)
+        """
+        with self.lock:
+            super().ensure_restructured()
+
+    def take_optimal(self, backpack_capacity: int) -> int:
+        """
+        Atomically finds and removes the ideal treasure, see MysticalHollow.get_optimal_treasure.
+
+        Complexity:
+            Best Case Complexity: O(log n), where n is the number of treasures in the hollow,
+                plus the time spent waiting for the lock.
+            Worst Case Complexity: O(log n), plus the time spent waiting for the lock.
+        """
+        with self.lock:
+            return super().take_optimal(backpack_capacity)
+
+    def put_back(self, index: int) -> None:
+        """
+        Atomically returns a treasure to the hollow, see MysticalHollow.put_back.
+
+        Complexity:
+            Best Case Complexity: O(log n), plus the time spent waiting for the lock.
+            Worst Case Complexity: O(log n), plus the time spent waiting for the lock.
+        """
+        with self.lock:
+            super().put_back(index)
+
+    def __len__(self) -> int:
+        """
+        Counts the treasures while holding the lock, so it never reads the hollow
+        while another thread is restructuring or updating it.
+
+        Complexity:
+            Best Case Complexity: O(1), plus the time spent waiting for the lock.
+            Worst Case Complexity: O(1), plus the time spent waiting for the lock.
+        """
+        with self.lock:
+            return super().__len__()
+
+    def get_optimal_treasures(self, backpack_capacities: List[int]) -> List[Treasure | None]:
+        """
+        Runs the whole batch while holding the lock, so no other thread can take
+        a treasure between two of its queries. See MysticalHollow.get_optimal_treasures.
+
+        Complexity:
+            Best Case Complexity: O(q), where q is the number of queries, plus the time spent waiting for the lock.
+            Worst Case Complexity: O(q log n), plus the time spent waiting for the lock.
+        """
+        with self.lock:
+            return super().get_optimal_treasures(backpack_capacities)
+
+    def get_ordered_treasures(self) -> List[Treasure]:
+        """
+        Takes a consistent snapshot of the ordering, see MysticalHollow.get_ordered_treasures.
+
+        Complexity:
+            Best Case Complexity: O(n log n), plus the time spent waiting for the lock.
+            Worst Case Complexity: O(n log n), plus the time spent waiting for the lock.
+        """
+        with self.lock:
+            return super().get_ordered_treasures()
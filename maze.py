@@ -4,7 +4,8 @@ from dataclasses import dataclass
 from typing import List, Tuple
 
 from config import Directions, Tiles
-from hollows import Hollow, MysticalHollow, SpookyHollow
+from data_structures.linked_stack import LinkedStack
+from hollows import ConcurrentMysticalHollow, Hollow, MysticalHollow, SpookyHollow
 from treasure import Treasure
 
 
@@ -71,6 +72,9 @@ class Maze:
         self.rows: int = rows
         self.cols: int = cols
         self.grid: List[List[MazeCell]] = self._create_grid(walls, hollows, end_positions)
+        # Changes made since the oldest open checkpoint, and the log length at each checkpoint
+        self.undo_log: LinkedStack[tuple[MazeCell | Hollow, bool | int]] = LinkedStack()
+        self.checkpoints: LinkedStack[int] = LinkedStack()
 
     def _create_grid(self, walls: List[Position], hollows: List[(Hollow, Position)], end_positions: List[Position]) -> List[List[MazeCell]]:
         """
@@ -149,10 +153,12 @@ class Maze:
             raise ValueError(f"Invalid tile(s) found in {maze_name} ({invalid_tiles})")
 
     @classmethod
-    def load_maze_from_file(cls, maze_name: str) -> Maze:
+    def load_maze_from_file(cls, maze_name: str, thread_safe: bool = False) -> Maze:
         """
         Args:
             maze_name(str): The maze name to load the maze from.
+            thread_safe(bool): Share a ConcurrentMysticalHollow between the mystical tiles,
+                so several threads can take treasures from the maze at the same time.
 
         Return:
             Maze: The newly created maze instance.
@@ -165,7 +171,7 @@ class Maze:
         """
         cls.validate_maze_file(maze_name)
         end_positions, walls, hollows = [], [], []
-        mystical_hollow: MysticalHollow = MysticalHollow()
+        mystical_hollow: MysticalHollow = ConcurrentMysticalHollow() if thread_safe else MysticalHollow()
         start_position: Position | None = None
         with open(f"./mazes/{maze_name}", 'r') as f:
             lines: List[str] = f.readlines()
@@ -298,7 +304,7 @@ class Maze:
             return False
         # Mark the current cell as visited
         cell = self.grid[current_position.row][current_position.col]
-        cell.visited = True
+        self._set_visited(cell, True)
         path.append(current_position)
         if cell.tile == Tiles.EXIT.value:
             return True
@@ -322,6 +328,8 @@ class Maze:
 
         You do not have to validate the path, it is guaranteed to be a valid path.
 
+        While a checkpoint is open, every treasure taken is recorded so that rollback can put it back.
+
         Args:
             path (List[MazeCell]): The path you took to reach the exit.
             backpack_capacity (int): The maximum weight you can carry.
@@ -352,14 +360,154 @@ class Maze:
             if isinstance(cell.tile, Hollow):
                 hollow = cell.tile
 
-                optimal_treasure = hollow.get_optimal_treasure(remaining_capacity)
-                if optimal_treasure and optimal_treasure.weight <= remaining_capacity:
+                optimal_index = hollow.take_optimal(remaining_capacity)
+                if optimal_index != -1:
+                    self._record(hollow, optimal_index)
+                    optimal_treasure = hollow.store[optimal_index]
                     treasures_taken.append(optimal_treasure)
                     remaining_capacity -= optimal_treasure.weight
 
         return treasures_taken if treasures_taken else None
 
-    
+    def take_treasures_sweep(self, path: List[MazeCell], backpack_capacities: List[int]) -> List[List[Treasure] | None]:
+        """
+        Works out what take_treasures would return for every backpack capacity
+        in backpack_capacities, as if each run started from the current hollows.
+        The hollows are not modified.
+
+        The path is walked once. Each hollow on it is asked for its treasures in
+        order of value / weight ratio the first time it is reached, and that ordering
+        is shared by every capacity. Each capacity keeps one cursor per hollow into the
+        ordering: the remaining capacity only goes down, so a treasure passed over because
+        it was too heavy, or already taken, can never be taken by that capacity later,
+        and the cursor never moves back.
+
+        Args:
+            path (List[MazeCell]): The path you took to reach the exit.
+            backpack_capacities (List[int]): The backpack capacities to evaluate.
+
+        Returns:
+            List[List[Treasure] | None] - The result of take_treasures for each capacity,
+            in the same order as backpack_capacities.
+
+        Complexity:
+            Best Case Complexity: O(n + h * m log m), where n is the number of cells in the path,
+            h is the number of distinct hollows on the path and m is the largest number of treasures in a hollow.
+                Explanation: There is no capacity to evaluate, so only the path is walked
+                and the ordering of each hollow is built once.
+            Worst Case Complexity: O(n * k + h * m log m + h * k * m), where k is the number of capacities.
+                Explanation: Each hollow visit costs O(1) per capacity plus the positions its cursor moves over,
+                and a cursor moves over each of the m positions of its hollow at most once.
+        """
+        orderings: dict[Hollow, List[Treasure]] = {}
+        remaining_capacities: List[int] = list(backpack_capacities)
+        treasures_taken: List[List[Treasure]] = [[] for _ in backpack_capacities]
+        cursors: List[dict[Hollow, int]] = [{} for _ in backpack_capacities]
+
+        for cell in path:
+            if not isinstance(cell.tile, Hollow):
+                continue
+            hollow = cell.tile
+            if hollow not in orderings:
+                orderings[hollow] = hollow.get_ordered_treasures()
+            ordering = orderings[hollow]
+
+            for query in range(len(remaining_capacities)):
+                position = cursors[query].get(hollow, 0)
+                while position < len(ordering) and ordering[position].weight > remaining_capacities[query]:
+                    position += 1
+                if position < len(ordering):
+                    treasure = ordering[position]
+                    treasures_taken[query].append(treasure)
+                    remaining_capacities[query] -= treasure.weight
+                    position += 1
+                cursors[query][hollow] = position
+
+        return [treasures if treasures else None for treasures in treasures_taken]
+
+
+    def _set_visited(self, cell: MazeCell, visited: bool) -> None:
+        """
+        Sets the visited flag of a cell, recording the old value if a checkpoint is open.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if cell.visited != visited:
+            self._record(cell, cell.visited)
+            cell.visited = visited
+
+    def _record(self, target: MazeCell | Hollow, value: bool | int) -> None:
+        """
+        Adds a change to the undo log. Nothing is recorded while there is no open checkpoint.
+
+        Args:
+            target (MazeCell | Hollow): What was changed.
+            value (bool | int): The old visited flag of a cell, or the store index of a treasure taken from a hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if not self.checkpoints.is_empty():
+            self.undo_log.push((target, value))
+
+    def checkpoint(self) -> None:
+        """
+        Starts recording the changes made to the maze, so they can be undone by rollback.
+        The changes recorded are cells marked as visited and treasures taken by take_treasures.
+        Checkpoints can be nested, rollback and commit always apply to the latest one.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self.checkpoints.push(len(self.undo_log))
+
+    def rollback(self) -> None:
+        """
+        Undoes every recorded change made since the latest checkpoint, newest first,
+        and closes that checkpoint.
+
+        Raises:
+            ValueError: If there is no open checkpoint.
+
+        Complexity:
+            Best Case Complexity: O(1), nothing changed since the checkpoint.
+            Worst Case Complexity: O(c log m), where c is the number of changes made since the checkpoint
+                and m is the largest number of treasures in a hollow.
+                Explanation: Resetting a visited flag is O(1) and putting a treasure back in its hollow is O(log m).
+                The rest of the maze is never looked at.
+        """
+        if self.checkpoints.is_empty():
+            raise ValueError("No checkpoint to roll back to")
+        mark: int = self.checkpoints.pop()
+        while len(self.undo_log) > mark:
+            target, value = self.undo_log.pop()
+            if isinstance(target, MazeCell):
+                target.visited = value
+            else:
+                target.put_back(value)
+
+    def commit(self) -> None:
+        """
+        Closes the latest checkpoint and keeps the changes made since it.
+        If an older checkpoint is still open the changes can still be undone by rolling back to it.
+
+        Raises:
+            ValueError: If there is no open checkpoint.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.checkpoints.is_empty():
+            raise ValueError("No checkpoint to commit")
+        self.checkpoints.pop()
+        if self.checkpoints.is_empty():
+            self.undo_log.clear()
+
     def __str__(self) -> str:
         """
         Returns the grid in a human-readable format.
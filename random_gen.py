@@ -6,11 +6,80 @@ Random number generator class. Uses LCG method with some reasonable initialisati
 __author__ = "Jackson Goerner"
 
 import time
-from typing import List, TypeVar
+from array import array
+from typing import Callable, List, TypeVar
 
 T = TypeVar('T')
 
 
+def lcg_jump_map(steps: int, a: int, c: int, mod: int) -> tuple[int, int]:
+    """
+    Returns (a_n, c_n) such that the LCG state `steps` draws after any x is (a_n * x + c_n) % mod.
+
+    One draw is the affine map x -> (a * x + c) % mod. Composing two affine maps gives
+    another one, so the map for `steps` draws is built by repeated squaring.
+    :complexity: O(log(steps))
+    """
+    if steps < 0:
+        raise ValueError(f"Cannot jump a negative number of draws ({steps})")
+    total_a, total_c = 1, 0
+    step_a, step_c = a, c
+    while steps > 0:
+        if steps & 1:
+            total_a, total_c = (step_a * total_a) % mod, (step_a * total_c + step_c) % mod
+        # The map for twice as many draws is this map applied to itself
+        step_a, step_c = (step_a * step_a) % mod, ((step_a + 1) * step_c) % mod
+        steps >>= 1
+    return total_a, total_c
+
+
+def lcg_jump(seed: int, steps: int, a: int, c: int, mod: int) -> int:
+    """
+    Returns the LCG state `steps` draws after `seed`, without making the draws.
+    :complexity: O(log(steps))
+    """
+    jump_a, jump_c = lcg_jump_map(steps, a, c, mod)
+    return (jump_a * seed + jump_c) % mod
+
+
+def lcg_randints(seed: int, lo: int, hi: int, n: int, a: int, c: int, mod: int) -> tuple[int, array]:
+    """
+    Makes n draws of randint(lo, hi) starting from `seed`.
+    Returns the seed after the last draw and the draws as an array('q').
+    :complexity: O(n)
+    """
+    span: int = hi - lo + 1
+    draws: array = array('q', bytes(8 * n))
+    for i in range(n):
+        seed = (a * seed + c) % mod
+        draws[i] = (seed >> 16) % span + lo
+    return seed, draws
+
+
+def lcg_random_floats(seed: int, n: int, a: int, c: int, mod: int) -> tuple[int, array]:
+    """
+    Makes n draws of random_float() starting from `seed`.
+    Returns the seed after the last draw and the draws as an array('d').
+    :complexity: O(n)
+    """
+    draws: array = array('d', bytes(8 * n))
+    for i in range(n):
+        seed = (a * seed + c) % mod
+        draws[i] = (seed >> 16) / (1 << 32)
+    return seed, draws
+
+
+def fisher_yates_shuffle(collection: List, randint: Callable[[int, int], int]) -> None:
+    """
+    Shuffles a collection that supports __getitem__, __setitem__ and __len__ in place,
+    drawing each swap position with randint(lo, hi).
+    :complexity: O(len(collection))
+    """
+    for i in range(len(collection) - 1, 0, -1):
+        j: int = randint(0, i)
+        collection[i], collection[j] = collection[j], collection[i]
+
+
 class RandomGen:
     """
     Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
@@ -23,6 +92,7 @@ class RandomGen:
     RandomGen.random()           # Random number from 0 to 2^32-1
     RandomGen.randint(1, 10)     # Random number from 1 to 10
     RandomGen.random_chance(0.33) # True 33% of the time, False 67% of the time.
+    RandomGen.randints(1, 10, 5) # array of 5 random numbers from 1 to 10
     ```
     """
 
@@ -44,6 +114,14 @@ class RandomGen:
         cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
         return cls.seed >> 16
 
+    @classmethod
+    def jump(cls, steps: int) -> None:
+        """
+        Skips the next `steps` calls to `random`, as if they had been made.
+        :complexity: O(log(steps))
+        """
+        cls.seed = lcg_jump(cls.seed, steps, cls.A, cls.C, cls.MOD)
+
     @classmethod
     def random_float(cls) -> float:
         """Returns a random floating point integer in the range 0 to 1."""
@@ -64,14 +142,131 @@ class RandomGen:
         """Returns a random choice from a collection that supports __getitem__ and __len__"""
         return collection[cls.randint(0, len(collection)-1)]
 
+    @classmethod
+    def randints(cls, lo: int, hi: int, n: int) -> array:
+        """
+        Returns n random integers from `lo` to `hi` inclusive, as an array('q').
+        Gives exactly the same numbers as n calls to `randint(lo, hi)`.
+        :complexity: O(n)
+        """
+        cls.seed, draws = lcg_randints(cls.seed, lo, hi, n, cls.A, cls.C, cls.MOD)
+        return draws
+
+    @classmethod
+    def random_floats(cls, n: int) -> array:
+        """
+        Returns n random floats in the range 0 to 1, as an array('d').
+        Gives exactly the same numbers as n calls to `random_float()`.
+        :complexity: O(n)
+        """
+        cls.seed, draws = lcg_random_floats(cls.seed, n, cls.A, cls.C, cls.MOD)
+        return draws
+
     @classmethod
     def random_shuffle(cls, collection: List) -> None:
         """
-        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
+        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__, in place
         :complexity: O(len(collection))
         """
-        positions = [(RandomGen.random(), i) for i in range(len(collection))]
-        positions.sort()  # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
-        tmp = [collection[p[1]] for p in positions]
-        for x in range(len(collection)):
-            collection[x] = tmp[x]
+        fisher_yates_shuffle(collection, cls.randint)
+
+
+class RandomStream:
+    """
+    An independent random number stream, with the same LCG as RandomGen.
+
+    RandomGen has a single class-level seed, so everything in the process shares one
+    sequence. Each RandomStream has its own seed instead, so workers can each get a
+    reproducible stream. Streams can also skip ahead by any number of draws in
+    logarithmic time, which lets one seed be split into disjoint substreams.
+    A stream created with the same seed as RandomGen makes exactly the same draws.
+
+    All methods are O(1) best/worst case time complexity unless stated otherwise.
+
+    Usage:
+    ```
+    stream = RandomStream(123)
+    stream.randint(1, 10)         # Same as RandomGen.randint(1, 10) after RandomGen.set_seed(123)
+    workers = stream.split(4, 10**6)  # 4 streams, each starting 10**6 draws after the previous one
+    ```
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Creates a stream, seeded with the current time if no seed is given."""
+        self.seed: int = time.time_ns() if seed is None else seed
+
+    def random(self) -> int:
+        """Returns a random integer from 0 to 2^32-1"""
+        self.seed = (RandomGen.A * self.seed + RandomGen.C) % RandomGen.MOD
+        return self.seed >> 16
+
+    def random_float(self) -> float:
+        """Returns a random floating point integer in the range 0 to 1."""
+        return self.random() / (1 << 32)
+
+    def randint(self, lo: int, hi: int) -> int:
+        """Returns a random integer from `lo` to `hi` inclusive on both ends."""
+        return (self.random() % (hi - lo + 1)) + lo
+
+    def random_chance(self, ratio: float) -> bool:
+        """Returns random()/2^32 < ratio"""
+        return self.random_float() < ratio
+
+    def random_choice(self, collection: List[T]) -> T:
+        """Returns a random choice from a collection that supports __getitem__ and __len__"""
+        return collection[self.randint(0, len(collection)-1)]
+
+    def randints(self, lo: int, hi: int, n: int) -> array:
+        """
+        Returns n random integers from `lo` to `hi` inclusive, as an array('q').
+        :complexity: O(n)
+        """
+        self.seed, draws = lcg_randints(self.seed, lo, hi, n, RandomGen.A, RandomGen.C, RandomGen.MOD)
+        return draws
+
+    def random_floats(self, n: int) -> array:
+        """
+        Returns n random floats in the range 0 to 1, as an array('d').
+        :complexity: O(n)
+        """
+        self.seed, draws = lcg_random_floats(self.seed, n, RandomGen.A, RandomGen.C, RandomGen.MOD)
+        return draws
+
+    def random_shuffle(self, collection: List) -> None:
+        """
+        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__,
+        in the same way as RandomGen.random_shuffle.
+        :complexity: O(len(collection))
+        """
+        fisher_yates_shuffle(collection, self.randint)
+
+    def jump(self, steps: int) -> None:
+        """
+        Skips the next `steps` calls to `random`, as if they had been made.
+        :complexity: O(log(steps))
+        """
+        self.seed = lcg_jump(self.seed, steps, RandomGen.A, RandomGen.C, RandomGen.MOD)
+
+    def spawn(self, steps: int) -> RandomStream:
+        """
+        Returns a new stream that starts `steps` draws ahead of this one. This stream is not changed.
+        :complexity: O(log(steps))
+        """
+        return RandomStream(lcg_jump(self.seed, steps, RandomGen.A, RandomGen.C, RandomGen.MOD))
+
+    def split(self, count: int, stride: int) -> List[RandomStream]:
+        """
+        Splits this stream into `count` substreams, the i-th starting i * stride draws ahead of this one.
+        As long as each substream makes at most `stride` draws, they never overlap.
+        This stream is not changed.
+        The map for `stride` draws is built once, then applied in O(1) to get each next seed.
+        :complexity: O(count + log(stride))
+        """
+        mod: int = RandomGen.MOD
+        stride_a, stride_c = lcg_jump_map(stride, RandomGen.A, RandomGen.C, mod)
+        streams: List[RandomStream] = []
+        seed: int = self.seed
+        for _ in range(count):
+            streams.append(RandomStream(seed))
+            seed = (stride_a * seed + stride_c) % mod
+        return streams
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen, RandomStream
+
+
+class TestRandomGen(TestCase):
+    @number("0.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_stream_matches_random_gen(self) -> None:
+        RandomGen.set_seed(123)
+        stream = RandomStream(123)
+        for _ in range(100):
+            self.assertEqual(stream.randint(1, 1000), RandomGen.randint(1, 1000))
+
+        # Streams are independent of each other and of RandomGen
+        first, second = RandomStream(5), RandomStream(5)
+        first.random()
+        RandomGen.random()
+        self.assertNotEqual(first.seed, second.seed)
+        second.random()
+        self.assertEqual(first.seed, second.seed)
+
+    @number("0.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_jump_ahead(self) -> None:
+        for steps in [0, 1, 2, 7, 64, 1000, 12345]:
+            stepped = RandomStream(2024)
+            for _ in range(steps):
+                stepped.random()
+            jumped = RandomStream(2024)
+            jumped.jump(steps)
+            self.assertEqual(jumped.seed, stepped.seed, f"Jumping {steps} draws should match making them")
+
+        RandomGen.set_seed(99)
+        RandomGen.jump(500)
+        stream = RandomStream(99)
+        stream.jump(500)
+        self.assertEqual(RandomGen.random(), stream.random())
+
+        with self.assertRaises(ValueError):
+            RandomStream(1).jump(-1)
+
+    @number("0.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_split_into_substreams(self) -> None:
+        stride: int = 50
+        base = RandomStream(77)
+        seed_before: int = base.seed
+        substreams: List[RandomStream] = base.split(4, stride)
+        self.assertEqual(base.seed, seed_before, "Splitting should not advance the stream")
+
+        # The substreams laid end to end are exactly the original sequence
+        expected: List[int] = [base.random() for _ in range(4 * stride)]
+        actual: List[int] = [stream.random() for stream in substreams for _ in range(stride)]
+        self.assertEqual(actual, expected)
+
+        spawned = RandomStream(77).spawn(stride)
+        self.assertEqual(spawned.random(), expected[stride])
+
+    @number("0.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bulk_draws_match_scalar_draws(self) -> None:
+        RandomGen.set_seed(31)
+        expected_ints: List[int] = [RandomGen.randint(-5, 20) for _ in range(200)]
+        expected_floats: List[float] = [RandomGen.random_float() for _ in range(200)]
+        seed_after: int = RandomGen.seed
+
+        RandomGen.set_seed(31)
+        self.assertEqual(list(RandomGen.randints(-5, 20, 200)), expected_ints)
+        self.assertEqual(list(RandomGen.random_floats(200)), expected_floats)
+        self.assertEqual(RandomGen.seed, seed_after, "Bulk draws should leave the seed where scalar draws would")
+
+        stream = RandomStream(31)
+        self.assertEqual(list(stream.randints(-5, 20, 200)), expected_ints)
+        self.assertEqual(list(stream.random_floats(200)), expected_floats)
+        self.assertEqual(len(stream.randints(1, 2, 0)), 0)
+
+    @number("0.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_shuffle_in_place(self) -> None:
+        items: List[int] = list(range(100))
+        RandomGen.set_seed(8)
+        RandomGen.random_shuffle(items)
+        self.assertNotEqual(items, list(range(100)))
+        self.assertEqual(sorted(items), list(range(100)))
+
+        # The same seed gives the same shuffle, whether from RandomGen or a stream
+        again: List[int] = list(range(100))
+        RandomStream(8).random_shuffle(again)
+        self.assertEqual(again, items)
+
+        single: List[int] = [1]
+        RandomGen.random_shuffle(single)
+        self.assertEqual(single, [1])
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 from random import Random
+import math
 from typing import List, Tuple
 from unittest import TestCase
 
 from betterbst import BetterBST
+from data_structures.array_bst import ArrayBinarySearchTree
+from data_structures.avl import AVLTree
+from data_structures.bst_codec import (HAS_LEFT, HAS_RIGHT, INT_CODEC, MAGIC, PICKLE_CODEC, STR_CODEC, decode_tree,
+                                       encode_tree)
+from data_structures.bplus_tree import BPlusInternal, BPlusTree
+from data_structures.bst import BinarySearchTree, BSTInOrderIterator, BSTPostOrderIterator, BSTPreOrderIterator
+from data_structures.node import CompactTreeNode
+from data_structures.persistent_avl import PersistentAVLTree
+from data_structures.splay import SplayTree
 from ed_utils.decorators import number, visibility
 
 
@@ -45,3 +55,536 @@ class TestTask1(TestCase):
         better_bst = BetterBST(numbers)
 
         self.assertEqual(better_bst.is_balanced(), True, "The tree should be balanced")
+
+    @number("1.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bst_degenerate_tree(self) -> None:
+        # Far deeper than the recursion limit
+        n: int = 2000
+        bst: BinarySearchTree = BinarySearchTree()
+        for key in range(n):
+            bst[key] = str(key)
+        self.assertEqual(len(bst), n)
+        self.assertEqual(bst.get_maximal(bst.root).depth, n, "Depth should count from 1 at the root")
+        self.assertEqual(bst[n - 1], str(n - 1))
+        self.assertEqual(bst.get_minimal(bst.root).key, 0)
+
+        with self.assertRaises(ValueError):
+            bst[n // 2] = "duplicate"
+        with self.assertRaises(KeyError):
+            _ = bst[n]
+        with self.assertRaises(ValueError):
+            del bst[n]
+        self.assertEqual(len(bst), n, "Failed operations should not change the tree")
+
+        for key in range(0, n, 2):
+            del bst[key]
+        self.assertEqual(len(bst), n // 2)
+        self.assertEqual([node.key for node in BSTInOrderIterator(bst.root)], list(range(1, n, 2)))
+
+    @number("1.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bst_delete_matches_dict(self) -> None:
+        random = Random(38)
+        bst: BinarySearchTree = BinarySearchTree()
+        expected: dict[int, int] = {}
+        for _ in range(2000):
+            key: int = random.randint(0, 300)
+            if key in expected:
+                del bst[key]
+                del expected[key]
+            else:
+                bst[key] = key * 2
+                expected[key] = key * 2
+            self.assertEqual(len(bst), len(expected))
+        self.assertEqual([(node.key, node.item) for node in bst], sorted(expected.items()))
+
+    @number("1.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_avl_stays_balanced(self) -> None:
+        avl: AVLTree = AVLTree()
+        self.assertTrue(avl.is_balanced())
+        for key in range(1000):
+            avl[key] = str(key)
+        self.assertTrue(avl.check_invariants(), "Sequential inserts should not skew an AVL tree")
+        self.assertLessEqual(avl.root.height, 1.45 * math.log2(len(avl) + 2))
+        self.assertEqual([node.key for node in avl], list(range(1000)))
+
+        random = Random(39)
+        expected: dict[int, str] = {key: str(key) for key in range(1000)}
+        for _ in range(3000):
+            key: int = random.randint(0, 1500)
+            if key in expected:
+                del avl[key]
+                del expected[key]
+            else:
+                avl[key] = str(key)
+                expected[key] = str(key)
+        self.assertTrue(avl.check_invariants(), "Mixed inserts and deletes should keep the tree balanced")
+        self.assertEqual([(node.key, node.item) for node in avl], sorted(expected.items()))
+        self.assertLessEqual(avl.root.height, 1.45 * math.log2(len(avl) + 2))
+
+        # A chain built without rotations is not an AVL tree, whichever check is used
+        unbalanced: BinarySearchTree = BinarySearchTree()
+        for key in range(8):
+            unbalanced[key] = str(key)
+        chain: AVLTree = AVLTree()
+        chain.root, chain.length = unbalanced.root, len(unbalanced)
+        self.assertFalse(chain.is_balanced())
+        self.assertFalse(chain.check_invariants())
+
+        with self.assertRaises(ValueError):
+            avl[next(iter(expected))] = "duplicate"
+        with self.assertRaises(ValueError):
+            del avl[-1]
+        with self.assertRaises(KeyError):
+            _ = avl[-1]
+
+    @number("1.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_order_statistics(self) -> None:
+        random = Random(40)
+        keys: List[int] = random.sample(range(10000), 500)
+        for tree in [BinarySearchTree(), AVLTree()]:
+            for key in keys:
+                tree[key] = key
+            for key in keys[::3]:
+                del tree[key]
+            remaining: List[int] = sorted(keys[i] for i in range(len(keys)) if i % 3 != 0)
+
+            self.assertEqual([tree.kth(i).key for i in range(len(tree))], remaining)
+            for _ in range(200):
+                probe: int = random.randint(-10, 10010)
+                self.assertEqual(tree.rank(probe), len([key for key in remaining if key < probe]))
+                other: int = random.randint(-10, 10010)
+                self.assertEqual(tree.count_range(probe, other),
+                                 len([key for key in remaining if probe <= key < other]))
+            with self.assertRaises(IndexError):
+                tree.kth(len(tree))
+            with self.assertRaises(IndexError):
+                tree.kth(-1)
+
+        better_bst: BetterBST = BetterBST([(x, str(x)) for x in range(1, 17)])
+        self.assertEqual(better_bst.kth(4).key, 5)
+        self.assertEqual(better_bst.count_range(3, 9), 6)
+
+    @number("1.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_range_queries(self) -> None:
+        keys: List[int] = list(range(0, 200, 5))
+        shuffled: List[int] = keys[:]
+        Random(41).shuffle(shuffled)
+        trees: List[BinarySearchTree] = [BinarySearchTree(), AVLTree()]
+        for tree in trees:
+            for key in shuffled:
+                tree[key] = str(key)
+        trees.append(BetterBST([(key, str(key)) for key in keys]))
+
+        for tree in trees:
+            self.assertEqual(tree.floor(12).key, 10)
+            self.assertEqual(tree.floor(15).key, 15)
+            self.assertIsNone(tree.floor(-1))
+            self.assertEqual(tree.ceiling(12).key, 15)
+            self.assertEqual(tree.ceiling(15).key, 15)
+            self.assertIsNone(tree.ceiling(196))
+
+            self.assertEqual([node.key for node in tree.lower_bound(93)], list(range(95, 200, 5)))
+            self.assertEqual(list(tree.lower_bound(1000)), [])
+            self.assertEqual(list(tree.items(20, 40)), [(key, str(key)) for key in range(20, 40, 5)])
+            self.assertEqual([key for key, _ in tree.items(hi=11)], [0, 5, 10])
+            self.assertEqual([key for key, _ in tree.items(186)], [190, 195])
+            self.assertEqual(len(list(tree.items())), len(keys))
+
+            # The iterator is lazy and can be moved again
+            iterator = tree.lower_bound(50)
+            self.assertEqual(next(iterator).key, 50)
+            self.assertEqual(next(iterator.seek(7)).key, 10)
+
+    @number("1.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_reusable_iterators(self) -> None:
+        bst: BinarySearchTree = BinarySearchTree()
+        for key in [5, 3, 8, 1, 4, 7, 9, 2, 6]:
+            bst[key] = str(key)
+        expected: dict[type, List[int]] = {
+            BSTPreOrderIterator: [5, 3, 1, 2, 4, 8, 7, 6, 9],
+            BSTInOrderIterator: [1, 2, 3, 4, 5, 6, 7, 8, 9],
+            BSTPostOrderIterator: [2, 1, 4, 3, 6, 7, 9, 8, 5],
+        }
+        for iterator_type, keys in expected.items():
+            iterator = iterator_type(bst.root)
+            self.assertEqual([node.key for node in iterator], keys)
+            self.assertEqual([node.key for node in iterator.reset(bst.root)], keys, "Reset should restart the traversal")
+            self.assertEqual(list(iterator.reset(None)), [], "An empty tree has nothing to traverse")
+
+            # Stopping part way and restarting does not leave anything behind
+            next(iterator.reset(bst.root))
+            self.assertEqual([node.key for node in iterator.reset(bst.root.left)], [key for key in keys if key < 5])
+
+            # Neither finishing a traversal nor resetting part way keeps nodes on the stack
+            list(iterator.reset(bst.root))
+            self.assertTrue(all(slot is None for slot in iterator.stack), "Popped slots should be cleared")
+            next(iterator.reset(bst.root))
+            iterator.reset(None)
+            self.assertTrue(all(slot is None for slot in iterator.stack), "Reset should clear the slots in use")
+
+    @number("1.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_compact_trees(self) -> None:
+        class CompactAVLTree(AVLTree):
+            node_type = CompactTreeNode
+
+        random = Random(43)
+        trees = [CompactAVLTree(), ArrayBinarySearchTree()]
+        expected: dict[int, str] = {}
+        for _ in range(3000):
+            key: int = random.randint(0, 400)
+            for tree in trees:
+                if key in expected:
+                    del tree[key]
+                else:
+                    tree[key] = str(key)
+            if key in expected:
+                del expected[key]
+            else:
+                expected[key] = str(key)
+
+        compact, array_tree = trees
+        self.assertFalse(hasattr(compact.root, "__dict__"), "Compact nodes should not have a __dict__")
+        self.assertTrue(compact.is_balanced())
+        self.assertEqual([(node.key, node.item) for node in compact], sorted(expected.items()))
+
+        self.assertEqual(len(array_tree), len(expected))
+        self.assertEqual(list(array_tree.items()), sorted(expected.items()))
+        self.assertEqual(list(array_tree.keys()), sorted(expected))
+        with self.assertRaises(TypeError):
+            iter(array_tree)
+        self.assertEqual(list(array_tree.items(100, 120)), sorted((k, v) for k, v in expected.items() if 100 <= k < 120))
+        for key in range(401):
+            self.assertEqual(key in array_tree, key in expected)
+        self.assertLessEqual(array_tree.capacity(), 401, "Deleted slots should be reused")
+        with self.assertRaises(KeyError):
+            _ = array_tree[-1]
+        with self.assertRaises(ValueError):
+            del array_tree[-1]
+        with self.assertRaises(ValueError):
+            array_tree[next(iter(expected))] = "duplicate"
+
+    @number("1.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_better_bst_bulk_operations(self) -> None:
+        random = Random(44)
+        keys: List[int] = random.sample(range(10000), 600)
+        evens: List[Tuple[int, str]] = [(key, str(key)) for key in keys if key % 2 == 0]
+        odds: List[Tuple[int, str]] = [(key, str(key)) for key in keys if key % 2 == 1]
+
+        a: BetterBST = BetterBST(evens)
+        b: BetterBST = BetterBST(odds)
+        self.assertEqual(len(a), len(evens))
+        self.assertTrue(a.is_balanced())
+        self.assertEqual(a.root.depth, 1)
+        for node in a:
+            self.assertEqual(node.size, 1 + a.size_of(node.left) + a.size_of(node.right), "Sizes should be set by the build")
+            for child in [node.left, node.right]:
+                if child is not None:
+                    self.assertEqual(child.depth, node.depth + 1)
+
+        with self.assertRaises(ValueError):
+            BetterBST([(1, "a"), (1, "b"), (0, "c")])
+        with self.assertRaises(ValueError):
+            BetterBST([(0, "a"), (2, "b"), (1, "c")], presorted=True)
+
+        merged: BetterBST = BetterBST.merge(a, b)
+        self.assertEqual([node.key for node in merged], sorted(keys))
+        self.assertEqual(len(merged), len(keys))
+        self.assertTrue(merged.is_balanced())
+        self.assertEqual(len(a), len(evens), "Merging should not change the trees merged")
+        with self.assertRaises(ValueError):
+            BetterBST.merge(a, a)
+
+        batch: List[Tuple[int, str]] = [(key, str(key)) for key in range(10001, 10200, 3)]
+        a.update(batch)
+        self.assertEqual([node.key for node in a], sorted(key for key, _ in evens + batch))
+        self.assertTrue(a.is_balanced())
+        self.assertEqual(a[10004], "10004")
+        with self.assertRaises(ValueError):
+            a.update([(10004, "duplicate")])
+        with self.assertRaises(ValueError):
+            a.update([(20002, "x"), (20001, "y")])
+        self.assertEqual(len(a), len(evens) + len(batch), "A failed update should not change the tree")
+
+    @number("1.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_avl_split_and_join(self) -> None:
+        random = Random(45)
+        keys: List[int] = random.sample(range(5000), 1000)
+        for threshold in [-1, 0, 1234, 2500, 4999, 6000]:
+            tree: AVLTree = AVLTree()
+            for key in keys:
+                tree[key] = str(key)
+
+            left, right = tree.split(threshold)
+            self.assertEqual(len(tree), 0, "Splitting moves the nodes out of the tree")
+            self.assertEqual([node.key for node in left], sorted(key for key in keys if key < threshold))
+            self.assertEqual([node.key for node in right], sorted(key for key in keys if key >= threshold))
+            self.assertEqual(len(left) + len(right), len(keys))
+            self.assertTrue(left.check_invariants() and right.check_invariants())
+
+            joined: AVLTree = AVLTree.join(left, right)
+            self.assertEqual([(node.key, node.item) for node in joined], sorted((key, str(key)) for key in keys))
+            self.assertEqual(len(joined), len(keys))
+            self.assertTrue(joined.check_invariants())
+            self.assertEqual(len(left) + len(right), 0, "Joining moves the nodes out of both trees")
+
+        # Very different heights
+        small: AVLTree = AVLTree()
+        small[10 ** 6] = "big"
+        big: AVLTree = AVLTree()
+        for key in range(2000):
+            big[key] = str(key)
+        joined = AVLTree.join(big, small)
+        self.assertTrue(joined.check_invariants())
+        self.assertEqual(joined.get_maximal(joined.root).key, 10 ** 6)
+
+        overlapping: AVLTree = AVLTree()
+        overlapping[5] = "5"
+        with self.assertRaises(ValueError):
+            AVLTree.join(joined, overlapping)
+
+    @number("1.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_persistent_versions(self) -> None:
+        random = Random(46)
+        versions: List[PersistentAVLTree] = [PersistentAVLTree()]
+        contents: List[dict[int, str]] = [{}]
+        for _ in range(400):
+            key: int = random.randint(0, 150)
+            latest: dict[int, str] = dict(contents[-1])
+            if key in latest:
+                versions.append(versions[-1].delete(key))
+                del latest[key]
+            else:
+                versions.append(versions[-1].insert(key, str(key)))
+                latest[key] = str(key)
+            contents.append(latest)
+
+        for version, expected in zip(versions, contents):
+            self.assertEqual([(node.key, node.item) for node in version], sorted(expected.items()),
+                             "Every version should still hold what it held when it was made")
+            self.assertEqual(len(version), len(expected))
+            self.assertTrue(version.check_invariants())
+
+        # Updating in place moves the tree on, but not its snapshots
+        tree: PersistentAVLTree = versions[-1]
+        before = tree.snapshot()
+        size: int = len(tree)
+        tree[1000] = "1000"
+        self.assertEqual(len(before), size)
+        self.assertNotIn(1000, before)
+        self.assertIn(1000, tree)
+
+        # A new version shares everything but the path it changed
+        old_nodes: set[int] = {id(node) for node in before}
+        new_nodes: List[int] = [id(node) for node in tree]
+        copied: int = len([node for node in new_nodes if node not in old_nodes])
+        self.assertLessEqual(copied, 3 * tree.root.height)
+
+        left, right = tree.split(75)
+        self.assertEqual(len(tree), size + 1, "Splitting should not change a persistent tree")
+        self.assertEqual([node.key for node in PersistentAVLTree.join(left, right)], [node.key for node in tree])
+        self.assertEqual(len(left) + len(right), size + 1, "Joining should not change persistent trees")
+
+    @number("1.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_tree_encoding(self) -> None:
+        random = Random(47)
+        keys: List[int] = random.sample(range(-10 ** 9, 10 ** 9), 500)
+        avl: AVLTree = AVLTree()
+        for key in keys:
+            avl[key] = str(key) * 3
+
+        data: bytes = encode_tree(avl, INT_CODEC, STR_CODEC)
+        decoded = decode_tree(data, AVLTree(), INT_CODEC, STR_CODEC)
+        self.assertEqual([(node.key, node.item) for node in decoded], [(node.key, node.item) for node in avl])
+        self.assertEqual([node.key for node in BSTPreOrderIterator(decoded.root)],
+                         [node.key for node in BSTPreOrderIterator(avl.root)], "The shape should be kept")
+        self.assertEqual(len(decoded), len(avl))
+        self.assertTrue(decoded.check_invariants(), "Heights should be recomputed")
+        self.assertEqual(decoded.kth(100).key, avl.kth(100).key, "Sizes should be recomputed")
+        del decoded[keys[0]]
+        decoded[10 ** 10] = "new"
+
+        # Degenerate trees are far deeper than the recursion limit
+        chain: BinarySearchTree = BinarySearchTree()
+        for key in range(1500):
+            chain[key] = (key, [key])
+        decoded_chain = decode_tree(encode_tree(chain, INT_CODEC, PICKLE_CODEC), BinarySearchTree(), INT_CODEC, PICKLE_CODEC)
+        self.assertEqual(decoded_chain.get_maximal(decoded_chain.root).depth, 1500)
+        self.assertEqual(decoded_chain[1499], (1499, [1499]))
+
+        empty = decode_tree(encode_tree(BinarySearchTree(), INT_CODEC, INT_CODEC), BinarySearchTree(), INT_CODEC, INT_CODEC)
+        self.assertTrue(empty.is_empty())
+        with self.assertRaises(ValueError):
+            decode_tree(b"nope", BinarySearchTree(), INT_CODEC, INT_CODEC)
+        with self.assertRaises(ValueError):
+            decode_tree(data[:-3], AVLTree(), INT_CODEC, STR_CODEC)
+        with self.assertRaises(ValueError):
+            decode_tree(data + b"\x00", AVLTree(), INT_CODEC, STR_CODEC)
+        for flags in [HAS_LEFT, HAS_RIGHT]:
+            # One node promising a child that never comes
+            target: BinarySearchTree = BinarySearchTree()
+            with self.assertRaises(ValueError):
+                decode_tree(MAGIC + bytes([1, flags, 1, 7, 1, 8]), target, INT_CODEC, INT_CODEC)
+            self.assertTrue(target.is_empty(), "A failed decode should leave the tree empty")
+
+    def check_bplus_tree(self, tree: BPlusTree) -> None:
+        """ Checks every node is sorted and full enough, and every leaf is at the same depth. """
+        leaf_depths: set[int] = set()
+        stack: List[tuple] = [(tree.root, 1, None, None)]
+        while stack:
+            node, depth, lo, hi = stack.pop()
+            self.assertEqual(node.keys, sorted(node.keys))
+            for key in node.keys:
+                self.assertTrue((lo is None or lo <= key) and (hi is None or key < hi), "Keys should be within their separators")
+            if isinstance(node, BPlusInternal):
+                self.assertEqual(len(node.children), len(node.keys) + 1)
+                self.assertLessEqual(len(node.children), tree.fanout)
+                if node is not tree.root:
+                    self.assertGreaterEqual(len(node.children), tree.min_fill)
+                bounds: list = [lo] + node.keys + [hi]
+                for i, child in enumerate(node.children):
+                    stack.append((child, depth + 1, bounds[i], bounds[i + 1]))
+            else:
+                leaf_depths.add(depth)
+                self.assertLessEqual(len(node.keys), tree.fanout)
+                if node is not tree.root:
+                    self.assertGreaterEqual(len(node.keys), tree.min_fill)
+        self.assertEqual(len(leaf_depths), 1, "Every leaf should be at the same depth")
+
+    @number("1.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bplus_tree(self) -> None:
+        random = Random(48)
+        for fanout in [3, 4, 5, 16]:
+            tree: BPlusTree = BPlusTree(fanout)
+            expected: dict[int, str] = {}
+            for step in range(3000):
+                key: int = random.randint(0, 600)
+                if key in expected:
+                    del tree[key]
+                    del expected[key]
+                else:
+                    tree[key] = str(key)
+                    expected[key] = str(key)
+                if step % 500 == 0:
+                    self.check_bplus_tree(tree)
+            self.check_bplus_tree(tree)
+            self.assertEqual(len(tree), len(expected))
+            self.assertEqual(list(tree.items()), sorted(expected.items()))
+            self.assertEqual(list(tree.keys()), sorted(expected))
+            self.assertEqual(list(tree.items(100, 200)), sorted((k, v) for k, v in expected.items() if 100 <= k < 200))
+            self.assertEqual(list(tree.items(hi=-1)), [])
+            for key in range(601):
+                self.assertEqual(key in tree, key in expected)
+
+            for key in list(expected):
+                del tree[key]
+            self.assertTrue(tree.is_empty())
+            self.check_bplus_tree(tree)
+
+        with self.assertRaises(KeyError):
+            _ = tree[1]
+        with self.assertRaises(ValueError):
+            del tree[1]
+        tree[1] = "1"
+        with self.assertRaises(ValueError):
+            tree[1] = "duplicate"
+        with self.assertRaises(ValueError):
+            BPlusTree(2)
+        with self.assertRaises(TypeError):
+            iter(tree)
+
+    def leaf_depths(self, tree: BinarySearchTree) -> List[int]:
+        """ Returns the actual depth of every leaf, with the root at depth 1. """
+        depths: List[int] = []
+        stack: List[tuple] = [(tree.root, 1)] if tree.root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            if node.left is None and node.right is None:
+                depths.append(depth)
+            for child in [node.left, node.right]:
+                if child is not None:
+                    stack.append((child, depth + 1))
+        return depths
+
+    @number("1.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_balance_check_stays_accurate(self) -> None:
+        self.assertTrue(BinarySearchTree().is_balanced(), "An empty tree is balanced")
+
+        random = Random(49)
+        bst: BinarySearchTree = BinarySearchTree()
+        keys: List[int] = random.sample(range(1000), 300)
+        for key in keys:
+            bst[key] = key
+        for step, key in enumerate(keys[:280]):
+            del bst[key]
+            depths: List[int] = self.leaf_depths(bst)
+            self.assertEqual(bst.root.height, max(depths))
+            self.assertEqual(bst.root.min_height, min(depths))
+            target: int = math.ceil(math.log2(len(bst)))
+            self.assertEqual(bst.is_balanced(), all(target - 1 <= depth <= target + 1 for depth in depths))
+
+        # Deleting the root of a chain promotes its child, leaving a chain one shorter
+        chain: BinarySearchTree = BinarySearchTree()
+        for key in range(5):
+            chain[key] = key
+        self.assertFalse(chain.is_balanced())
+        for key in range(3):
+            del chain[key]
+        self.assertTrue(chain.is_balanced(), "Two nodes in a chain are balanced")
+
+    @number("1.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_splay_tree(self) -> None:
+        random = Random(50)
+        splay: SplayTree = SplayTree()
+        expected: dict[int, str] = {}
+        for _ in range(3000):
+            key: int = random.randint(0, 400)
+            operation: int = random.randint(0, 2)
+            if operation == 0:
+                self.assertEqual(key in splay, key in expected)
+            elif key in expected:
+                del splay[key]
+                del expected[key]
+            else:
+                splay[key] = str(key)
+                expected[key] = str(key)
+            self.assertEqual(len(splay), len(expected))
+        self.assertEqual([(node.key, node.item) for node in splay], sorted(expected.items()))
+        self.assertEqual(splay.root.size, len(expected), "Sizes should be kept through rotations")
+        self.assertEqual(splay.kth(10).key, sorted(expected)[10])
+
+        # Whatever was touched last is at the root
+        hot: int = sorted(expected)[len(expected) // 2]
+        self.assertEqual(splay[hot], str(hot))
+        self.assertEqual(splay.root.key, hot)
+        splay[1000] = "1000"
+        self.assertEqual(splay.root.key, 1000)
+
+        # Sequential inserts make a chain, one lookup of its far end roughly halves it
+        chain: SplayTree = SplayTree()
+        for key in range(1500):
+            chain[key] = key
+        self.assertEqual(chain.root.height, 1500)
+        _ = chain[0]
+        self.assertLessEqual(chain.root.height, 760)
+
+        with self.assertRaises(KeyError):
+            _ = splay[-1]
+        with self.assertRaises(ValueError):
+            del splay[-1]
+        with self.assertRaises(ValueError):
+            splay[hot] = "duplicate"
+        self.assertEqual(len(splay), len(expected) + 1, "Failed operations should not change the keys")
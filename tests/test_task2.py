@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
+from fractions import Fraction
+from random import Random
 from typing import List
 from unittest import TestCase
 
+from algorithms.radix_sort import radix_sort
+from betterbst import BetterBST
+from data_structures.bst import BSTPreOrderIterator
 from ed_utils.decorators import number, visibility
-from hollows import Hollow, MysticalHollow, SpookyHollow
-from treasure import Treasure
+from hollows import ConcurrentMysticalHollow, Hollow, MysticalHollow, SpookyHollow
+from random_gen import RandomGen
+from treasure import (Treasure, TreasureStore, generate_treasure_store, generate_treasures, ratio_key,
+                      shuffle_sample_treasures)
+from weighted_bst import WeightedBetterBST
 
 
 class TestTask2(TestCase):
@@ -73,6 +83,13 @@ class TestTask2(TestCase):
             self.assertIsNone(mystical_hollow.get_optimal_treasure(1), "Expected None as all the treasures are removed")
             self.assertIsNone(mystical_hollow.get_optimal_treasure(0), "Expected None as all the treasures are removed")
 
+        # Hollows generated without any treasure
+        Hollow.gen_treasures = lambda _: []
+        for hollow in [SpookyHollow(), MysticalHollow()]:
+            self.assertIsNone(hollow.get_optimal_treasure(100), "Expected None from a hollow with no treasures")
+            self.assertEqual(len(hollow), 0, "Expected an empty hollow to stay empty")
+        self.assertEqual(MysticalHollow().get_optimal_treasures([0, 100]), [None, None], "Expected None for every query")
+
     @number("2.4")
     @visibility(visibility.VISIBILITY_SHOW)
     def test_heavy_hollows(self) -> None:
@@ -91,3 +108,203 @@ class TestTask2(TestCase):
         for _ in range(10):
             self.assertIsNone(mystical_hollow.get_optimal_treasure(1), "Expected None as the only treasures are heavier than provided backpack capacity")
             self.assertIsNone(mystical_hollow.get_optimal_treasure(0), "Expected None as the only treasures are heavier than provided backpack capacity")
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_spooky_hollow_heavy_best_ratios(self) -> None:
+        # The best ratios are the heaviest treasures, so the hollow has to look past them
+        random: Random = Random(1008)
+        weights: List[int] = random.sample(range(1, 101), 40)
+        values: List[int] = random.sample(range(1, 101), 40)
+        treasures: List[Treasure] = [Treasure(value, weight) for value, weight in zip(values, weights)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        spooky_hollow: SpookyHollow = SpookyHollow()
+        remaining: List[Treasure] = list(treasures)
+        for capacity in [random.randint(0, 100) for _ in range(60)]:
+            fitting: List[Treasure] = [t for t in remaining if t.weight <= capacity]
+            expected: Treasure | None = max(fitting, key=lambda t: t.value / t.weight) if fitting else None
+            self.assertEqual(spooky_hollow.get_optimal_treasure(capacity), expected, f"Wrong treasure for backpack capacity {capacity}")
+            if expected is not None:
+                remaining.remove(expected)
+            self.assertEqual(len(spooky_hollow), len(remaining), "Expected only the optimal treasure to be removed")
+
+    @number("2.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mystical_hollow_heavy_best_ratios(self) -> None:
+        random: Random = Random(2024)
+        weights: List[int] = random.sample(range(1, 101), 40)
+        values: List[int] = random.sample(range(1, 101), 40)
+        treasures: List[Treasure] = [Treasure(value, weight) for value, weight in zip(values, weights)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        mystical_hollow: MysticalHollow = MysticalHollow()
+        remaining: List[Treasure] = list(treasures)
+        for capacity in [random.randint(0, 100) for _ in range(60)]:
+            fitting: List[Treasure] = [t for t in remaining if t.weight <= capacity]
+            expected: Treasure | None = max(fitting, key=lambda t: t.value / t.weight) if fitting else None
+            self.assertEqual(mystical_hollow.get_optimal_treasure(capacity), expected, f"Wrong treasure for backpack capacity {capacity}")
+            if expected is not None:
+                remaining.remove(expected)
+            self.assertEqual(len(mystical_hollow), len(remaining), "Expected only the optimal treasure to be removed")
+
+    @number("2.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mystical_hollow_batch_queries(self) -> None:
+        random: Random = Random(1008)
+        weights: List[int] = random.sample(range(1, 101), 30)
+        values: List[int] = random.sample(range(1, 101), 30)
+        treasures: List[Treasure] = [Treasure(value, weight) for value, weight in zip(values, weights)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        capacities: List[int] = [random.randint(0, 100) for _ in range(50)]
+        one_by_one: MysticalHollow = MysticalHollow()
+        expected: List[Treasure | None] = [one_by_one.get_optimal_treasure(capacity) for capacity in capacities]
+
+        batched: MysticalHollow = MysticalHollow()
+        self.assertEqual(batched.get_optimal_treasures(capacities), expected, "Batch queries should match repeated get_optimal_treasure calls")
+        self.assertEqual(len(batched), len(one_by_one), "Batch queries removed a different number of treasures")
+        self.assertEqual(batched.get_optimal_treasures([]), [], "An empty batch should take nothing")
+
+    @number("2.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_lazy_restructuring(self) -> None:
+        previous_gen = Hollow.__dict__["gen_treasures"]
+        self.addCleanup(setattr, Hollow, "gen_treasures", previous_gen)
+        Hollow.gen_treasures = staticmethod(generate_treasure_store)
+
+        RandomGen.set_seed(1008)
+        hollows: List[Hollow] = [SpookyHollow(), MysticalHollow(), SpookyHollow()]
+        RandomGen.set_seed(1008)
+        generated: List[List[Treasure]] = [generate_treasures() for _ in hollows]
+
+        for hollow, treasures in zip(hollows, generated):
+            self.assertIsInstance(hollow.treasures, TreasureStore, "Hollows should not be restructured before they are used")
+            self.assertEqual(len(hollow), len(treasures), "Length should be available before restructuring")
+
+        # Use the hollows in a different order to the one they were created in
+        for hollow, treasures in reversed(list(zip(hollows, generated))):
+            expected: Treasure = max(treasures, key=lambda t: t.value / t.weight)
+            self.assertEqual(hollow.get_optimal_treasure(100), expected, "Lazy restructuring changed the hollow's treasures")
+            self.assertIsInstance(hollow.treasures, hollow.structure_type, "The hollow should be restructured after its first query")
+            self.assertEqual(len(hollow), len(treasures) - 1, "Expected exactly one treasure to be removed")
+
+        # Hollow's own contract is unchanged: implementing its abstract methods is enough
+        class PlainHollow(Hollow):
+            def restructure_hollow(self) -> None:
+                pass
+
+            def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
+                return None
+
+        plain: Hollow = PlainHollow()
+        self.assertIsInstance(plain.treasures, TreasureStore, "Expected the treasures from gen_treasures")
+        self.assertGreater(len(plain), 0)
+
+    @number("2.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_exact_ratio_keys(self) -> None:
+        pairs: List[tuple[int, int]] = [(value, weight) for value in range(1, 101) for weight in range(1, 101)]
+        pairs.sort(key=lambda pair: Fraction(*pair))
+        for (v1, w1), (v2, w2) in zip(pairs, pairs[1:]):
+            k1, k2 = ratio_key(v1, w1), ratio_key(v2, w2)
+            if Fraction(v1, w1) == Fraction(v2, w2):
+                self.assertEqual(k1, k2, f"Equal ratios {v1}/{w1} and {v2}/{w2} should share a key")
+            else:
+                self.assertLess(k1, k2, f"Ratio keys of {v1}/{w1} and {v2}/{w2} are out of order")
+
+        random: Random = Random(1008)
+        numbers: List[int] = [random.randint(0, 10 ** 6) for _ in range(500)]
+        self.assertEqual(radix_sort(numbers), sorted(numbers), "Radix sort gave the wrong order")
+        labelled: List[tuple[int, int]] = [(random.randint(0, 5), i) for i in range(100)]
+        self.assertEqual(radix_sort(labelled, lambda pair: pair[0]), sorted(labelled), "Radix sort should be stable")
+
+    @number("2.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_fast_treasure_generation(self) -> None:
+        RandomGen.set_seed(1008)
+        first: List[Treasure] = generate_treasures(fast=True)
+        RandomGen.set_seed(1008)
+        self.assertEqual(generate_treasures(fast=True), first, "Fast generation should be deterministic for a seed")
+
+        RandomGen.set_seed(1008)
+        store: TreasureStore = shuffle_sample_treasures(95, 100, 100)
+        self.assertEqual(len(store), 95, "Expected the requested number of treasures")
+        self.assertEqual(len(set(store.weights)), 95, "Weights should be unique")
+        self.assertEqual(len(set(store.values)), 95, "Values should be unique")
+        self.assertEqual(len({Fraction(t.value, t.weight) for t in store}), 95, "Ratios should be unique")
+        self.assertRaises(ValueError, shuffle_sample_treasures, 11, 10, 100)
+
+    @number("2.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_concurrent_mystical_hollow(self) -> None:
+        RandomGen.set_seed(1008)
+        store: TreasureStore = shuffle_sample_treasures(2000, 4000, 4000)
+        treasures: List[Treasure] = list(store)
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        hollow: ConcurrentMysticalHollow = ConcurrentMysticalHollow()
+        random: Random = Random(1008)
+        capacities: List[List[int]] = [[random.randint(1, 4000) for _ in range(300)] for _ in range(8)]
+
+        def worker(worker_capacities: List[int]) -> List[Treasure]:
+            taken = [hollow.get_optimal_treasure(capacity) for capacity in worker_capacities]
+            return [treasure for treasure in taken if treasure is not None]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            taken: List[Treasure] = [treasure for result in pool.map(worker, capacities) for treasure in result]
+
+        taken_pairs = [(treasure.value, treasure.weight) for treasure in taken]
+        self.assertEqual(len(set(taken_pairs)), len(taken_pairs), "A treasure was handed to more than one thread")
+        self.assertEqual(len(hollow), len(treasures) - len(taken), "The hollow lost or duplicated treasures")
+        left_pairs = [(treasure.value, treasure.weight) for treasure in hollow.get_ordered_treasures()]
+        self.assertEqual(sorted(taken_pairs + left_pairs), sorted((t.value, t.weight) for t in treasures),
+                         "The treasures taken and left should be exactly the original treasures")
+
+        # len() waits for the lock, so it never sees the hollow half updated
+        with hollow.lock:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                length = pool.submit(len, hollow)
+                self.assertFalse(length.done() or wait([length], timeout=0.05).done, "len() should wait for the lock")
+                hollow.lock.release()
+                try:
+                    self.assertEqual(length.result(timeout=5), len(left_pairs))
+                finally:
+                    hollow.lock.acquire()
+
+    @number("2.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_spooky_hollow_put_back_stays_balanced(self) -> None:
+        random: Random = Random(97)
+        treasures: List[Treasure] = list(shuffle_sample_treasures(97, 500, 200))
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        hollow: SpookyHollow = SpookyHollow()
+        ordered: List[Treasure] = hollow.get_ordered_treasures()
+        tree: WeightedBetterBST = hollow.treasures
+        # The build only links the nodes, refresh should not have rotated any of them
+        plain: BetterBST = BetterBST([(node.key, node.item) for node in tree], presorted=True)
+        self.assertEqual([node.key for node in BSTPreOrderIterator(tree.root)],
+                         [node.key for node in BSTPreOrderIterator(plain.root)], "The build should not rotate")
+
+        for _ in range(300):
+            taken: List[int] = []
+            for _ in range(random.randint(1, 40)):
+                index: int = hollow.take_optimal(random.randint(1, 200))
+                if index != -1:
+                    taken.append(index)
+            for index in reversed(taken):
+                hollow.put_back(index)
+
+        self.assertEqual(hollow.get_ordered_treasures(), ordered, "Every treasure taken should be back")
+        # 1.44 * log2(n + 2) bounds the height of a tree where sibling heights differ by at most one
+        self.assertLessEqual(tree.root.height, 1.44 * math.log2(len(hollow) + 2))
+        for node in BSTPreOrderIterator(tree.root):
+            self.assertLessEqual(abs(tree.height_of(node.left) - tree.height_of(node.right)), 1)
+            weights: List[int] = [hollow.store.weights[inner.item] for inner in BSTPreOrderIterator(node)]
+            self.assertEqual(node.min_weight, min(weights), "Rotations should keep the minimum weights")
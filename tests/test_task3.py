@@ -7,6 +7,7 @@ from config import Directions, Tiles
 from ed_utils.decorators import number, visibility
 from hollows import Hollow
 from maze import Maze, MazeCell, Position
+from random_gen import RandomStream
 from treasure import Treasure
 
 
@@ -255,3 +256,92 @@ class TestTask3(TestCase):
         student_result: List[Treasure] | None = self.maze.take_treasures(path, 1008)
         expected: List[Treasure] = [Treasure(51, 6), Treasure(96, 13), Treasure(84, 14), Treasure(87, 23), Treasure(70, 19), Treasure(97, 30)]
         self.assertEqual(student_result, expected, f"Incorrect treasures taken {student_result}, expected {expected}")
+
+    @number("3.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_take_treasures_sweep(self) -> None:
+        self.maze: Maze = Maze.load_maze_from_file("/task3/treasures/maze1.txt")
+        path: List[tuple[int, int]] = [(3, 1), (2, 1), (1, 1), (1, 2), (2, 2), (3, 2), (3, 3), (2, 3), (1, 3), (1, 4), (2, 4),
+                                       (3, 4), (3, 5), (2, 5), (1, 5), (1, 6), (2, 6), (3, 6), (3, 7), (2, 7), (1, 7)]
+        path: List[MazeCell] = list(map(lambda p: self.maze.grid[p[0]][p[1]], path))
+        mystic_1: List[Treasure] = [Treasure(41, 42), Treasure(66, 1), Treasure(7, 73), Treasure(56, 51)]
+        spooky_1: List[Treasure] = [Treasure(44, 95), Treasure(60, 38), Treasure(67, 2), Treasure(68, 49)]
+        spooky_2: List[Treasure] = [Treasure(81, 93), Treasure(78, 19), Treasure(34, 3), Treasure(15, 65)]
+        treasures: List[List[Treasure]] = [mystic_1, spooky_1, spooky_2]
+        self.force_hollows(treasures)
+
+        capacities: List[int] = [0, 3, 7, 50, 100, 250, 1008]
+        student_result: List[List[Treasure] | None] = self.maze.take_treasures_sweep(path, capacities)
+        self.assertEqual(len(student_result), len(capacities), "Expected one result per capacity")
+        self.assertEqual([len(self.maze.grid[r][c].tile) for r, c in [(2, 1), (1, 6), (2, 7)]], [4, 4, 4],
+                         "The sweep should not remove treasures from the hollows")
+
+        for capacity, swept in zip(capacities, student_result):
+            # The sweep must not have touched the hollows, so a fresh run has to agree with it
+            self.force_hollows(treasures)
+            expected: List[Treasure] | None = self.maze.take_treasures(path, capacity)
+            self.assertEqual(swept, expected, f"Sweep disagrees with take_treasures for capacity {capacity}")
+
+    @number("3.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_checkpoint_rollback(self) -> None:
+        self.maze: Maze = Maze.load_maze_from_file("/task3/treasures/maze1.txt")
+        path: List[tuple[int, int]] = [(3, 1), (2, 1), (1, 1), (1, 2), (2, 2), (3, 2), (3, 3), (2, 3), (1, 3), (1, 4), (2, 4),
+                                       (3, 4), (3, 5), (2, 5), (1, 5), (1, 6), (2, 6), (3, 6), (3, 7), (2, 7), (1, 7)]
+        path: List[MazeCell] = list(map(lambda p: self.maze.grid[p[0]][p[1]], path))
+        mystic_1: List[Treasure] = [Treasure(41, 42), Treasure(66, 1), Treasure(7, 73), Treasure(56, 51)]
+        spooky_1: List[Treasure] = [Treasure(44, 95), Treasure(60, 38), Treasure(67, 2), Treasure(68, 49)]
+        spooky_2: List[Treasure] = [Treasure(81, 93), Treasure(78, 19), Treasure(34, 3), Treasure(15, 65)]
+        self.force_hollows([mystic_1, spooky_1, spooky_2])
+        hollows: List[Hollow] = [self.maze.grid[r][c].tile for r, c in [(2, 1), (1, 6), (2, 7)]]
+
+        self.maze.checkpoint()
+        self.assertIsNotNone(self.maze.find_way_out(), "Expected a way out of the maze")
+        first: List[Treasure] | None = self.maze.take_treasures(path, 1008)
+        self.assertEqual(len(first), 3, "Expected one treasure to be taken from each hollow")
+        self.maze.rollback()
+
+        self.assertFalse(any(cell.visited for row in self.maze.grid for cell in row), "Rollback should clear the visited flags")
+        self.assertEqual([len(hollow) for hollow in hollows], [4, 4, 4], "Rollback should put the treasures back")
+        self.assertEqual(self.maze.take_treasures(path, 1008), first, "The same treasures should be taken after a rollback")
+
+        # Nested checkpoints only undo their own changes
+        self.force_hollows([mystic_1, spooky_1, spooky_2])
+        self.maze.checkpoint()
+        self.maze.take_treasures(path, 7)
+        self.maze.checkpoint()
+        self.maze.take_treasures(path, 50)
+        self.maze.rollback()
+        self.assertEqual([len(hollow) for hollow in hollows], [3, 3, 3], "Only the inner changes should be undone")
+        self.maze.rollback()
+        self.assertEqual([len(hollow) for hollow in hollows], [4, 4, 4], "Expected the outer changes to be undone too")
+        self.assertRaises(ValueError, self.maze.rollback)
+
+    @number("3.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_rollback_keeps_hollows_balanced(self) -> None:
+        self.maze: Maze = Maze.load_maze_from_file("/task3/treasures/maze1.txt")
+        path: List[MazeCell] = [self.maze.grid[r][c] for r, c in [(3, 1), (2, 1), (1, 1), (1, 2), (2, 2), (3, 2), (3, 3), (2, 3),
+                                                                   (1, 3), (1, 4), (2, 4), (3, 4), (3, 5), (2, 5), (1, 5), (1, 6)]]
+        stream = RandomStream(1008)
+        values: List[int] = list(range(1, 500))
+        weights: List[int] = list(range(1, 200))
+        stream.random_shuffle(values)
+        stream.random_shuffle(weights)
+        spooky: List[Treasure] = [Treasure(value, weight) for value, weight in zip(values[:97], weights[:97])]
+        self.force_hollows([spooky, [Treasure(41, 42)], [Treasure(81, 93)]])
+        hollow: Hollow = self.maze.grid[1][6].tile
+        ordered: List[Treasure] = hollow.get_ordered_treasures()
+        height: int = hollow.treasures.root.height
+
+        for _ in range(300):
+            self.maze.checkpoint()
+            for _ in range(stream.randint(1, 40)):
+                self.maze.take_treasures(path, stream.randint(1, 200))
+            self.maze.rollback()
+
+        self.assertEqual(hollow.get_ordered_treasures(), ordered, "Rollback should put back every treasure taken")
+        # 1.44 * log2(n + 2) bounds the height of any AVL tree with n nodes, and bit_length() is at least log2
+        self.assertLessEqual(hollow.treasures.root.height, 1.44 * (len(hollow) + 2).bit_length(),
+                             "Putting treasures back should not make the hollow deeper")
+        self.assertLessEqual(hollow.treasures.root.height, height + 2, "Expected the hollow to stay close to its built height")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from array import array
+from typing import Iterator, List
+
 from config import TreasureConfig
 from random_gen import RandomGen
-from typing import List
 
 
 class Treasure:
@@ -29,39 +31,283 @@ class Treasure:
         return str(self)
 
 
-def generate_treasures() -> List[Treasure]:
+def ratio_key(value: int, weight: int, max_weight: int = TreasureConfig.MAX_TREASURE_WEIGHT.value) -> int:
     """
-    This function will generate a random list of treasures with random values and weights.
-    The weights, values and ratios of the treasures will be unique within the output list.
+    Exact integer key for the value / weight ratio of a treasure.
+
+    Two different ratios whose weights are at most max_weight differ by at least
+    1 / max_weight ** 2, so scaling them by max_weight ** 2 puts them at least 1 apart
+    and their floors are different. Keys therefore compare exactly like the ratios do,
+    equal ratios get equal keys, and no floating point division is involved.
+
+    Args:
+        value (int): The value of the treasure
+        weight (int): The weight of the treasure, at most max_weight
+        max_weight (int): The largest weight any compared treasure can have
 
     Returns:
-        list(Treasure): A random list of treasures
+        int: floor(value * max_weight ** 2 / weight), which is at most value * max_weight ** 2
+
+    Complexity:
+        O(1)
+    """
+    return value * max_weight * max_weight // weight
+
+
+class TreasureStore:
+    """
+    Compact, column based storage for the treasures of a hollow.
+
+    Instead of one Treasure object per treasure, the values, weights and value / weight
+    ratio keys are kept in parallel arrays and a treasure is referred to by its index.
+    Treasure objects are only created when one is read from the store.
+
+    Attributes:
+        * max_weight (int): the largest weight the store accepts, used to scale the ratio keys
+        * values (array[int]): value of every treasure
+        * weights (array[int]): weight of every treasure
+        * ratio_keys (array[int]): ratio_key of every treasure, compares like value / weight
+    """
+
+    def __init__(self, max_weight: int = TreasureConfig.MAX_TREASURE_WEIGHT.value) -> None:
+        """
+        Args:
+            max_weight (int): The largest weight of a treasure in this store
+
+        Complexity:
+            O(1)
+        """
+        self.max_weight: int = max_weight
+        self.values: array = array('i')
+        self.weights: array = array('i')
+        self.ratio_keys: array = array('q')
+
+    @classmethod
+    def from_treasures(cls, treasures: List[Treasure]) -> TreasureStore:
+        """
+        Copies a list of treasures into a new store, keeping their order.
+        The store accepts weights up to TreasureConfig.MAX_TREASURE_WEIGHT or
+        the heaviest of the treasures, whichever is larger.
+
+        Complexity:
+            O(n) where n is the number of treasures
+        """
+        max_weight: int = TreasureConfig.MAX_TREASURE_WEIGHT.value
+        for treasure in treasures:
+            max_weight = max(max_weight, treasure.weight)
+        store = cls(max_weight)
+        for treasure in treasures:
+            store.append(treasure.value, treasure.weight)
+        return store
+
+    def append(self, value: int, weight: int) -> int:
+        """
+        Adds a treasure to the end of the store.
+
+        Returns:
+            int: The index of the new treasure
+
+        Raises:
+            ValueError: If the weight is not between 1 and max_weight
+
+        Complexity:
+            O(1) amortised
+        """
+        if not 1 <= weight <= self.max_weight:
+            raise ValueError(f"Treasure weight {weight} is outside of 1 to {self.max_weight}")
+        self.values.append(value)
+        self.weights.append(weight)
+        self.ratio_keys.append(ratio_key(value, weight, self.max_weight))
+        return len(self.values) - 1
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Treasure:
+        """
+        Creates the Treasure stored at index.
+
+        Complexity:
+            O(1)
+        """
+        return Treasure(self.values[index], self.weights[index])
+
+    def __iter__(self) -> Iterator[Treasure]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def draw_batch(treasures_left: int) -> array:
+    """
+    Draws the raw random numbers for the next attempts of a treasure generator in one go.
+
+    Both generators make two randint calls per attempt and add at most one treasure per attempt,
+    so the next 2 * treasures_left draws are always made. Taking them with RandomGen.randints
+    leaves RandomGen exactly where the randint calls would have, and randint(lo, hi)
+    is then draw % (hi - lo + 1) + lo.
+
+    Args:
+        treasures_left (int): How many treasures the generator still has to add
+
+    Returns:
+        array: 2 * treasures_left draws of RandomGen.random(), as an array('q')
+
+    Complexity:
+        O(treasures_left)
+    """
+    return RandomGen.randints(0, (1 << 32) - 1, 2 * treasures_left)
+
+
+def rejection_sample_treasures(number_of_treasures: int, max_value: int, max_weight: int) -> TreasureStore:
+    """
+    Draws random treasures until number_of_treasures of them have a weight, a value
+    and a ratio that no earlier treasure has. Draws that clash are thrown away.
+
+    Args:
+        number_of_treasures (int): How many treasures to generate
+        max_value (int): Values are drawn from 1 to max_value
+        max_weight (int): Weights are drawn from 1 to max_weight
+
+    Returns:
+        TreasureStore: The generated treasures
+
+    Complexity:
+        Best Case Complexity: O(N), where N is number_of_treasures, when no draw clashes.
+        Worst Case Complexity: unbounded, the expected number of draws for the k-th treasure
+        grows like (max_weight / (max_weight - k)) * (max_value / (max_value - k)),
+        so it gets very slow as N approaches max_weight or max_value.
+
+        This assumes the randint and python set operations can be done in O(1) time.
+    """
+    store = TreasureStore(max_weight)
+    ratios: set[int] = set()
+    weights_used: set[int] = set()
+    values_used: set[int] = set()
+
+    while len(store) < number_of_treasures:
+        # Each attempt is a randint for the weight then one for the value, made from a batch of raw draws
+        draws: array = draw_batch(number_of_treasures - len(store))
+        for i in range(0, len(draws), 2):
+            weight: int = draws[i] % max_weight + 1
+            value: int = draws[i + 1] % max_value + 1
+            ratio: int = ratio_key(value, weight, max_weight)
+
+            if ratio not in ratios and weight not in weights_used and value not in values_used:
+                store.append(value, weight)
+                ratios.add(ratio)
+                weights_used.add(weight)
+                values_used.add(value)
+
+    return store
+
+
+def shuffle_sample_treasures(number_of_treasures: int, max_value: int, max_weight: int) -> TreasureStore:
+    """
+    Generates treasures with unique weights, values and ratios using partial Fisher-Yates shuffles.
+
+    The unused weights and values are kept at the back of two arrays. Each treasure
+    swaps a random unused weight and a random unused value to the front, so they can
+    never be drawn twice and no draw is wasted. If the value would repeat a ratio, the
+    next unused values are tried in turn, and if none of them fit the weight is skipped.
+
+    Args:
+        number_of_treasures (int): How many treasures to generate
+        max_value (int): Values are taken from 1 to max_value
+        max_weight (int): Weights are taken from 1 to max_weight
+
+    Returns:
+        TreasureStore: The generated treasures
+
+    Raises:
+        ValueError: If there are not enough weights or values for number_of_treasures unique treasures
+
+    Complexity:
+        Best Case Complexity: O(W + V), where W is max_weight and V is max_value, to fill the arrays,
+        then O(1) per treasure with two random draws when the value does not repeat a ratio.
+        Worst Case Complexity: O(W + V + W * V), when the values keep repeating ratios
+        and every unused value has to be tried for every weight.
+
+        This assumes the randint and python set operations can be done in O(1) time.
+    """
+    weights: array = array('i', range(1, max_weight + 1))
+    values: array = array('i', range(1, max_value + 1))
+    store = TreasureStore(max_weight)
+    ratios: set[int] = set()
+
+    weights_taken: int = 0
+    while len(store) < number_of_treasures:
+        # Each weight tried is a randint for the weight then one for the value, made from a batch of raw draws
+        draws: array = draw_batch(number_of_treasures - len(store))
+        for i in range(0, len(draws), 2):
+            if weights_taken == max_weight or len(store) == max_value:
+                raise ValueError(f"Cannot generate {number_of_treasures} unique treasures "
+                                 f"with weights up to {max_weight} and values up to {max_value}")
+            swap: int = weights_taken + draws[i] % (max_weight - weights_taken)
+            weights[weights_taken], weights[swap] = weights[swap], weights[weights_taken]
+            weight: int = weights[weights_taken]
+            weights_taken += 1
+
+            values_taken: int = len(store)
+            values_left: int = max_value - values_taken
+            start: int = draws[i + 1] % values_left
+            for offset in range(values_left):
+                swap = values_taken + (start + offset) % values_left
+                ratio: int = ratio_key(values[swap], weight, max_weight)
+                if ratio not in ratios:
+                    values[values_taken], values[swap] = values[swap], values[values_taken]
+                    store.append(values[values_taken], weight)
+                    ratios.add(ratio)
+                    break
+
+    return store
+
+
+def generate_treasure_store(fast: bool = False) -> TreasureStore:
+    """
+    This function will generate a random store of treasures with random values and weights.
+    The weights, values and ratios of the treasures will be unique within the store.
+    By default it makes exactly the same random draws as generate_treasures, without creating any Treasure objects.
+
+    Args:
+        fast (bool): Use shuffle_sample_treasures, which does a bounded amount of work per treasure,
+            instead of rejection_sample_treasures. Both are deterministic for a given RandomGen seed,
+            but they generate different treasures from the same seed.
+
+    Returns:
+        TreasureStore: A random store of treasures
 
     Complexity:
         Best Case Complexity: O(N)
         Worst Case Complexity: O(N) where N is TreasureConfig.MAX_NUMBER_OF_TREASURES.value
 
         This assumes the randint and python set operations can be done in O(1) time.
+        See rejection_sample_treasures and shuffle_sample_treasures for how this grows with N.
     """
     number_of_treasures = RandomGen.randint(TreasureConfig.MIN_NUMBER_OF_TREASURES.value,
                                             TreasureConfig.MAX_NUMBER_OF_TREASURES.value)
+    # Values have always been drawn from the weight range, keep it so seeds give the same treasures
+    max_value: int = TreasureConfig.MAX_TREASURE_WEIGHT.value
+    max_weight: int = TreasureConfig.MAX_TREASURE_WEIGHT.value
+    if fast:
+        return shuffle_sample_treasures(number_of_treasures, max_value, max_weight)
+    return rejection_sample_treasures(number_of_treasures, max_value, max_weight)
 
-    hollow_treasures: List[Treasure | None] = [None] * number_of_treasures
-    ratios: set[float] = set()
-    weights_used: set[int] = set()
-    values_used: set[int] = set()
 
-    treasure_count: int = 0
-    while treasure_count < number_of_treasures:
-        weight: int = RandomGen.randint(1, TreasureConfig.MAX_TREASURE_WEIGHT.value)
-        value: int = RandomGen.randint(1, TreasureConfig.MAX_TREASURE_WEIGHT.value)
-        ratio: float = value / weight
+def generate_treasures(fast: bool = False) -> List[Treasure]:
+    """
+    This function will generate a random list of treasures with random values and weights.
+    The weights, values and ratios of the treasures will be unique within the output list.
 
-        if ratio not in ratios and weight not in weights_used and value not in values_used:
-            hollow_treasures[treasure_count] = Treasure(value, weight)
-            ratios.add(ratio)
-            weights_used.add(weight)
-            values_used.add(value)
-            treasure_count += 1
+    Args:
+        fast (bool): See generate_treasure_store
+
+    Returns:
+        list(Treasure): A random list of treasures
 
-    return hollow_treasures
+    Complexity:
+        Best Case Complexity: O(N)
+        Worst Case Complexity: O(N) where N is TreasureConfig.MAX_NUMBER_OF_TREASURES.value
+
+        This assumes the randint and python set operations can be done in O(1) time.
+    """
+    return list(generate_treasure_store(fast))
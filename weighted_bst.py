@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Callable, List, Tuple, TypeVar
+
+from betterbst import BetterBST
+from data_structures.node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class WeightedBetterBST(BetterBST[K, I]):
+    """
+    BetterBST where every node also stores the smallest weight found in its subtree.
+    The weight of an item is given by the weight_of function.
+
+    This lets us find the first key (in order) whose item is light enough
+    by descending the tree once, instead of walking it in order.
+
+    The tree is built balanced like any BetterBST, then refresh rebalances it with rotations
+    after every insertion and deletion (see refresh), so keys deleted and inserted again,
+    in any order, never make it deeper than O(log(n)).
+    """
+
+    def __init__(self, elements: List[Tuple[K, I]], weight_of: Callable[[I], int], presorted: bool = False) -> None:
+        """
+        Args:
+            elements(List[tuple[K, I]]): The elements to be inserted into the tree.
+            weight_of(Callable[[I], int]): Returns the weight of an item.
+            presorted(bool): True if the elements are already sorted by key, see BetterBST.
+
+        Raises:
+            ValueError: If a key is repeated, see BetterBST.
+
+        Complexity:
+            Best Case Complexity: O(n), where n is the number of elements in the list, when presorted is True.
+            Worst Case Complexity: O(n * log(n)), where n is the number of elements in the list, for the merge sort.
+                Explanation: Same as BetterBST. The nodes are linked directly into a balanced tree and recomputed
+                bottom-up, so keeping the minimum weights is O(1) per node and the build itself is O(n).
+        """
+        self.weight_of: Callable[[I], int] = weight_of
+        super().__init__(elements, presorted)
+
+    def refresh(self, current: TreeNode) -> TreeNode:
+        """
+        Recomputes current, then rotates it if one of its subtrees is two levels higher than the other,
+        so the heights of the two subtrees of every node differ by at most one, as in an AVL tree.
+        The rotations recompute the nodes they move, so the minimum weights stay correct.
+
+        The balanced build also calls this, bottom-up, on nodes whose subtrees hold halves
+        of a segment. Their heights differ by at most one, so the build never rotates.
+
+        Returns:
+            TreeNode - the root of the rebalanced subtree.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self.recompute(current)
+        balance = self.height_of(current.left) - self.height_of(current.right)
+        if balance > 1:
+            if self.height_of(current.left.left) < self.height_of(current.left.right):
+                current.left = self.rotate_left(current.left)
+            return self.rotate_right(current)
+        if balance < -1:
+            if self.height_of(current.right.right) < self.height_of(current.right.left):
+                current.right = self.rotate_right(current.right)
+            return self.rotate_left(current)
+        return current
+
+    def recompute(self, current: TreeNode) -> None:
+        """
+        Recomputes the smallest weight in the subtree rooted at current from its children.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        super().recompute(current)
+        min_weight = self.weight_of(current.item)
+        if current.left is not None and current.left.min_weight < min_weight:
+            min_weight = current.left.min_weight
+        if current.right is not None and current.right.min_weight < min_weight:
+            min_weight = current.right.min_weight
+        current.min_weight = min_weight
+
+    def get_first_within(self, max_weight: int) -> TreeNode[K, I] | None:
+        """
+        Finds the node with the smallest key whose item weighs at most max_weight.
+
+        Args:
+            max_weight(int): The largest weight allowed.
+
+        Returns:
+            TreeNode - the first node in order whose item is light enough.
+            None - if every item is heavier than max_weight or the tree is empty.
+
+        Complexity:
+            Best Case Complexity: O(1), when the tree is empty or every item is too heavy,
+                which is known from the root alone.
+            Worst Case Complexity: O(D), where D is the depth of the tree.
+                Explanation: The stored minimum weights tell us which side holds the answer,
+                so only one child is visited per level.
+        """
+        current = self.root
+        if current is None or current.min_weight > max_weight:
+            return None
+        while True:
+            if current.left is not None and current.left.min_weight <= max_weight:
+                current = current.left
+            elif self.weight_of(current.item) <= max_weight:
+                return current
+            else:
+                # The subtree minimum is within the limit, so it has to be on the right
+                current = current.right